@@ -1,4 +1,78 @@
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+
+class Record:
+    """
+    Immutable, slotted inventory row that reads like the dict it replaces
+
+    Subclasses list their attributes in __slots__ and the matching dict keys
+    in KEYS (they differ only where the key is a Python keyword). Optional
+    attributes left as None are treated as missing keys.
+    """
+    __slots__ = ()
+    KEYS: tuple = ()
+
+    def __init__(self, *args, **kwargs):
+        values = dict(zip(self.__slots__, args))
+        values.update(kwargs)
+        for name in self.__slots__:
+            object.__setattr__(self, name, values.get(name))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Record":
+        """Build a record from a dict keyed like the UI rows."""
+        return cls(**{name: data.get(key) for name, key in zip(cls.__slots__, cls.KEYS)})
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value for a dict key, or default if it is missing."""
+        try:
+            value = getattr(self, self.__slots__[self.KEYS.index(key)])
+        except ValueError:
+            return default
+        return default if value is None else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the row as a plain dict for the UI and PDF."""
+        return {key: getattr(self, name) for name, key in zip(self.__slots__, self.KEYS)
+                if getattr(self, name) is not None}
+
+    def replace(self, **changes) -> "Record":
+        """Return a copy with some dict keys changed (e.g. a repriced row)."""
+        data = self.to_dict()
+        data.update(changes)
+        return type(self).from_dict(data)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._values() == other._values()
+
+    def __hash__(self):
+        return hash((type(self).__name__,) + self._values())
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class Flight(Record):
+    __slots__ = ("airline", "departure", "arrival", "price", "seat_class")
+    KEYS = ("airline", "departure", "arrival", "price", "class")
+
+class Hotel(Record):
+    __slots__ = ("name", "rating", "price", "type")
+    KEYS = ("name", "rating", "price", "type")
+
+class Activity(Record):
+    __slots__ = ("name", "duration", "price", "category", "type", "rating", "description")
+    KEYS = ("name", "duration", "price", "category", "type", "rating", "description")
 
 class TravelRequest:
     def __init__(self, destination: str, dates: str, budget: float,
@@ -15,15 +89,41 @@ class TravelRequest:
         self.interests = interests or []
 
 class TravelRecommendation:
-    def __init__(self, flights: List[Dict], hotels: List[Dict], activities: List[Dict], travel_plan: str = ""):
+    def __init__(self, flights: List[Flight], hotels: List[Hotel], activities: List[Activity], travel_plan: str = "",
+                 budget: Optional[float] = None, preferred_categories: Optional[List[str]] = None):
         self.flights = flights
         self.hotels = hotels
         self.activities = activities
         self.travel_plan = travel_plan
+        self.budget = budget
+        self.preferred_categories = preferred_categories
+
+    def get_best_bundles(self, nights: int = 5, top_k: Optional[int] = None) -> List:
+        """
+        Return the highest-scoring flight, hotel and activity bundles that fit the budget
+
+        Without a budget, every option is affordable and bundles are ranked on score alone.
+        """
+        from .optimizer import BUNDLE_MAX_ACTIVITIES, BUNDLE_TOP_K, optimize_bundles
+
+        budget = self.budget
+        if budget is None:
+            # Enough for the priciest flight, hotel and activities
+            activity_prices = sorted((activity["price"] for activity in self.activities), reverse=True)
+            budget = (2 * max((flight["price"] for flight in self.flights), default=0)
+                      + nights * max((hotel["price"] for hotel in self.hotels), default=0)
+                      + sum(activity_prices[:BUNDLE_MAX_ACTIVITIES]))
+
+        return optimize_bundles(self.flights, self.hotels, self.activities, budget, nights=nights,
+                                preferred_categories=self.preferred_categories,
+                                top_k=BUNDLE_TOP_K if top_k is None else top_k)
+
+    def get_total_cost(self, nights: int = 5) -> Optional[float]:
+        """
+        Calculate the total cost of the best trip bundle that fits the budget
 
-    def get_total_cost(self) -> float:
-        """Calculate the estimated total cost of the trip."""
-        flight_cost = sum(flight["price"] for flight in self.flights[:1]) * 2  # Round trip for first option
-        hotel_cost = sum(hotel["price"] for hotel in self.hotels[:1]) * 5  # 5 nights at first hotel
-        activity_cost = sum(activity["price"] for activity in self.activities[:3])  # Top 3 activities
-        return flight_cost + hotel_cost + activity_cost
+        Returns:
+            float: Cost of the best bundle, or None if no flight and hotel combination fits the budget
+        """
+        bundles = self.get_best_bundles(nights=nights, top_k=1)
+        return bundles[0].cost if bundles else None
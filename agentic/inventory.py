@@ -0,0 +1,169 @@
+"""
+File-backed, columnar travel inventory
+
+Each destination partition is a directory of one .npy file per column,
+sorted by price when written:
+
+    <INVENTORY_DIR>/<destination>/<category>/<column>.npy
+
+Columns are opened memory-mapped, so loading a partition only maps its files
+and the OS pages in what queries actually touch. Build a catalog from JSON
+({destination: {category: [rows]}}) with:
+
+    python -m agentic.inventory catalog.json --output data/inventory
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .interface import Activity, Flight, Hotel, Record
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Catalog location and the number of destination partitions kept loaded
+INVENTORY_DIR = os.getenv("INVENTORY_DIR", os.path.join("data", "inventory"))
+INVENTORY_CACHE_PARTITIONS = int(os.getenv("INVENTORY_CACHE_PARTITIONS", "64"))
+
+# Record type of each category's rows
+RECORD_TYPES = {"flights": Flight, "hotels": Hotel, "activities": Activity}
+
+# Columns stored as float64; every other column is a fixed-width unicode string
+NUMERIC_COLUMNS = {"price", "rating"}
+
+def destination_slug(destination: str) -> str:
+    """Normalize a destination name to its partition directory name."""
+    return re.sub(r"[^a-z0-9]+", "-", destination.strip().lower()).strip("-")
+
+def columns_from_rows(rows: List[Dict], category: str) -> Dict[str, np.ndarray]:
+    """
+    Convert rows to price-sorted column arrays
+
+    Missing numeric values become NaN and missing strings become "".
+
+    Args:
+        rows (list): Row dicts keyed like the category's record type
+        category (str): "flights", "hotels" or "activities"
+
+    Returns:
+        dict: Column name -> array, all sorted by price
+    """
+    rows = sorted(rows, key=lambda row: row["price"])
+    columns = {}
+    for key in RECORD_TYPES[category].KEYS:
+        values = [row.get(key) for row in rows]
+        if key in NUMERIC_COLUMNS:
+            columns[key] = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        else:
+            columns[key] = np.array(["" if value is None else str(value) for value in values], dtype=np.str_)
+    return columns
+
+def records_at(columns: Dict[str, np.ndarray], category: str, rows, **overrides) -> List[Record]:
+    """
+    Build records for some rows of a column set
+
+    Args:
+        columns (dict): Column name -> array
+        category (str): "flights", "hotels" or "activities"
+        rows: Row positions (array or list)
+        **overrides: Per-key values replacing the stored ones; a list or array
+            gives one value per row, anything else applies to every row
+
+    Returns:
+        list: Records in the order of rows
+    """
+    record_type = RECORD_TYPES[category]
+    rows = np.asarray(rows, dtype=np.intp)
+    values = []
+    for key in record_type.KEYS:
+        if key in overrides:
+            override = overrides[key]
+            if isinstance(override, (list, np.ndarray)):
+                values.append(np.asarray(override).tolist())
+            else:
+                values.append([override] * len(rows))
+            continue
+
+        column = np.asarray(columns[key][rows]).tolist()
+        if key in NUMERIC_COLUMNS:
+            values.append([None if value != value else value for value in column])  # NaN is missing
+        else:
+            values.append([value or None for value in column])
+    return [record_type(*row) for row in zip(*values)]
+
+def write_partition(directory: str, destination: str, category: str, rows: List[Dict]) -> str:
+    """
+    Write one destination and category as price-sorted column files
+
+    Returns:
+        str: The partition directory
+    """
+    path = os.path.join(directory, destination_slug(destination), category)
+    os.makedirs(path, exist_ok=True)
+    for key, column in columns_from_rows(rows, category).items():
+        np.save(os.path.join(path, f"{key}.npy"), column)
+    return path
+
+def write_inventory(directory: str, inventory: Dict[str, Dict[str, List[Dict]]]):
+    """Write a {destination: {category: [rows]}} catalog."""
+    for destination, categories in inventory.items():
+        for category, rows in categories.items():
+            write_partition(directory, destination, category, rows)
+
+class InventoryLoader:
+    """Reads destination partitions from a catalog directory as memory-mapped columns."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def has_destination(self, destination: str) -> bool:
+        """Return True if the catalog has a partition for the destination."""
+        return bool(self.directory) and os.path.isdir(os.path.join(self.directory, destination_slug(destination)))
+
+    def load(self, destination: str) -> Optional[Dict[str, Dict[str, np.ndarray]]]:
+        """
+        Map every category of a destination
+
+        Returns:
+            dict: category -> {column: array}, or None if the partition is missing or unreadable
+        """
+        if not self.has_destination(destination):
+            return None
+
+        partition = {}
+        base = os.path.join(self.directory, destination_slug(destination))
+        try:
+            for category, record_type in RECORD_TYPES.items():
+                path = os.path.join(base, category)
+                if os.path.isdir(path):
+                    partition[category] = {
+                        key: np.load(os.path.join(path, f"{key}.npy"), mmap_mode="r")
+                        for key in record_type.KEYS
+                    }
+        except (OSError, ValueError) as e:
+            logger.warning(f"Inventory partition for {destination} is unreadable: {str(e)}")
+            return None
+        return partition
+
+def main(argv=None):
+    """Build a catalog directory from a JSON inventory file."""
+    parser = argparse.ArgumentParser(description="Write a columnar inventory catalog from JSON.")
+    parser.add_argument("catalog", help="JSON file of {destination: {category: [rows]}}")
+    parser.add_argument("--output", default=INVENTORY_DIR, help="catalog directory")
+    args = parser.parse_args(argv)
+
+    with open(args.catalog, "r", encoding="utf-8") as f:
+        inventory = json.load(f)
+    write_inventory(args.output, inventory)
+    logger.info(f"Wrote {len(inventory)} destinations to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
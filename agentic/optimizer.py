@@ -0,0 +1,205 @@
+"""
+Budget-optimal trip bundles
+
+A bundle is one flight (round trip), one hotel for the whole stay and a set
+of activities. Bundles are scored by hotel rating, activity ratings and how
+well activities match the traveler's interests, and the best ones that fit
+the total budget are found with a knapsack DP over price buckets.
+"""
+import heapq
+import os
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Resolution of the price buckets the budget is divided into, and bundle shape limits
+BUNDLE_PRICE_BUCKETS = int(os.getenv("BUNDLE_PRICE_BUCKETS", "400"))
+BUNDLE_MAX_ACTIVITIES = int(os.getenv("BUNDLE_MAX_ACTIVITIES", "5"))
+BUNDLE_TOP_K = int(os.getenv("BUNDLE_TOP_K", "5"))
+
+# Scoring weights: ratings are scaled to 0-1 by their source's scale before weighting.
+# Flights carry no rating, so they score by how close they are to the cheapest fare.
+HOTEL_RATING_WEIGHT = 2.0
+FLIGHT_PRICE_WEIGHT = 0.5
+ACTIVITY_BASE_SCORE = 0.5
+ACTIVITY_INTEREST_SCORE = 1.0
+ACTIVITY_RATING_WEIGHT = 0.5
+
+# Rating scales per source: inventory hotels are rated 0-10, activities come from
+# Serper places, which are rated 0-5
+HOTEL_RATING_SCALE = 10.0
+ACTIVITY_RATING_SCALE = 5.0
+
+class TripBundle:
+    """One flight, one hotel and a set of activities, with their total cost and score."""
+    __slots__ = ("flight", "hotel", "activities", "cost", "score")
+
+    def __init__(self, flight, hotel, activities: List, cost: float, score: float):
+        self.flight = flight
+        self.hotel = hotel
+        self.activities = activities
+        self.cost = cost
+        self.score = score
+
+    def to_dict(self) -> Dict:
+        """Return the bundle as plain dicts for the UI and PDF."""
+        def plain(row):
+            return row.to_dict() if hasattr(row, "to_dict") else dict(row)
+
+        return {
+            "flight": plain(self.flight),
+            "hotel": plain(self.hotel),
+            "activities": [plain(activity) for activity in self.activities],
+            "cost": self.cost,
+            "score": self.score
+        }
+
+    def __repr__(self):
+        return f"TripBundle(cost={self.cost:.2f}, score={self.score:.3f})"
+
+def _rating(row, weight: float, scale: float) -> float:
+    """Return a row's rating scaled to 0-1 and weighted, or 0 if it is unrated (missing or not a number)."""
+    rating = row.get("rating")
+    if isinstance(rating, bool) or not isinstance(rating, (int, float)) or rating != rating:
+        return 0.0
+    return weight * min(max(rating / scale, 0.0), 1.0)
+
+def hotel_score(hotel) -> float:
+    """Score a hotel by its rating."""
+    return _rating(hotel, HOTEL_RATING_WEIGHT, HOTEL_RATING_SCALE)
+
+def activity_score(activity, preferred_categories: Optional[Iterable[str]] = None) -> float:
+    """Score an activity by interest match and rating."""
+    matches = preferred_categories is not None and activity.get("category") in preferred_categories
+    return ((ACTIVITY_INTEREST_SCORE if matches else ACTIVITY_BASE_SCORE)
+            + _rating(activity, ACTIVITY_RATING_WEIGHT, ACTIVITY_RATING_SCALE))
+
+def flight_scores(costs: np.ndarray) -> np.ndarray:
+    """Score flights by how close each fare is to the cheapest one (1 for the cheapest, weighted)."""
+    cheapest = costs.min()
+    if cheapest <= 0:
+        return np.where(costs <= 0, FLIGHT_PRICE_WEIGHT, 0.0)
+    return FLIGHT_PRICE_WEIGHT * cheapest / costs
+
+def pareto_front(costs: np.ndarray, scores: np.ndarray, depth: int = 1) -> np.ndarray:
+    """
+    Return the indices of the options dominated by fewer than depth others
+
+    An option is dominated by another that costs no more and scores no less,
+    and is strictly better in one of the two. An option dominated by depth
+    others can't be in the top depth results, since each of those beats it.
+    """
+    no_costlier = costs[None, :] <= costs[:, None]
+    no_worse = scores[None, :] >= scores[:, None]
+    strictly_better = (costs[None, :] < costs[:, None]) | (scores[None, :] > scores[:, None])
+    dominators = (no_costlier & no_worse & strictly_better).sum(axis=1)
+    return np.flatnonzero(dominators < depth)
+
+def _activity_table(weights: np.ndarray, values: np.ndarray, capacity: int, max_items: int) -> tuple:
+    """
+    Knapsack over activities with an item-count limit
+
+    Returns:
+        tuple: (best, take) where best[c, w] is the highest score using exactly
+        c activities with total bucket cost at most w (-inf if impossible), and
+        take[i, c, w] records whether activity i was added to reach that state
+    """
+    best = np.full((max_items + 1, capacity + 1), -np.inf)
+    best[0, :] = 0.0
+    take = np.zeros((len(weights), max_items + 1, capacity + 1), dtype=bool)
+
+    for i, (weight, value) in enumerate(zip(weights, values)):
+        if weight > capacity:
+            continue
+        candidate = np.full_like(best, -np.inf)
+        candidate[1:, weight:] = best[:-1, :capacity + 1 - weight] + value
+        take[i] = candidate > best
+        best = np.where(take[i], candidate, best)
+    return best, take
+
+def _chosen_activities(take: np.ndarray, weights: np.ndarray, count: int, capacity: int) -> List[int]:
+    """Walk the backpointers from state (count, capacity) to the chosen activity indices."""
+    chosen = []
+    for i in range(len(weights) - 1, -1, -1):
+        if count == 0:
+            break
+        if take[i, count, capacity]:
+            chosen.append(i)
+            count -= 1
+            capacity -= weights[i]
+    return chosen[::-1]
+
+def optimize_bundles(flights: Sequence, hotels: Sequence, activities: Sequence, budget: float,
+                     nights: int = 5, preferred_categories: Optional[Iterable[str]] = None,
+                     top_k: int = BUNDLE_TOP_K, max_activities: int = BUNDLE_MAX_ACTIVITIES,
+                     buckets: int = BUNDLE_PRICE_BUCKETS) -> List[TripBundle]:
+    """
+    Find the highest-scoring trip bundles that fit the total budget
+
+    Each (flight, hotel) pair is a candidate bundle, completed with its best
+    activity set for the remaining budget; the top_k candidates are returned.
+    Prices are rounded up to buckets of budget / buckets, so every returned
+    bundle fits the budget exactly; a bundle that only fits without rounding
+    may be missed. Flights and hotels dominated by top_k or more others
+    (no cheaper and no better) are pruned first, the activity sets come from
+    a vectorized knapsack DP, and the pairs are ranked with a top-K heap.
+
+    Args:
+        flights (list): Flight rows (round trip cost is twice the price)
+        hotels (list): Hotel rows priced per night
+        activities (list): Activity rows
+        budget (float): Total trip budget
+        nights (int): Length of the hotel stay
+        preferred_categories (iterable, optional): Activity categories matching the traveler's interests
+        top_k (int): Number of bundles to return
+        max_activities (int): Maximum activities per bundle
+        buckets (int): Number of price buckets the budget is divided into
+
+    Returns:
+        list: TripBundle objects, best first (highest score, then lowest cost)
+    """
+    if not flights or not hotels or budget <= 0:
+        return []
+
+    preferred_categories = set(preferred_categories) if preferred_categories is not None else None
+    bucket_size = budget / buckets
+
+    def to_buckets(costs):
+        # Round up (with a little slack for float noise) so bucket sums never understate real costs
+        return np.ceil(np.asarray(costs, dtype=np.float64) / bucket_size - 1e-9).astype(np.int64).clip(min=0)
+
+    flight_costs = np.array([2 * flight["price"] for flight in flights], dtype=np.float64)
+    flight_values = flight_scores(flight_costs)
+    hotel_costs = np.array([nights * hotel["price"] for hotel in hotels], dtype=np.float64)
+    hotel_values = np.array([hotel_score(hotel) for hotel in hotels])
+
+    flight_front = pareto_front(flight_costs, flight_values, top_k)
+    hotel_front = pareto_front(hotel_costs, hotel_values, top_k)
+
+    activity_costs = np.array([activity["price"] for activity in activities], dtype=np.float64)
+    activity_weights = to_buckets(activity_costs)
+    activity_values = np.array([activity_score(activity, preferred_categories) for activity in activities])
+    best, take = _activity_table(activity_weights, activity_values, buckets, max_activities)
+
+    # Best activity set per remaining capacity: the item count with the highest score
+    best_count = best.argmax(axis=0)
+    best_value = best.max(axis=0)
+
+    # Evaluate every non-dominated (flight, hotel) pair at once
+    pair_costs = flight_costs[flight_front][:, None] + hotel_costs[hotel_front][None, :]
+    remaining = buckets - (to_buckets(flight_costs[flight_front])[:, None] + to_buckets(hotel_costs[hotel_front])[None, :])
+    feasible = (remaining >= 0) & (pair_costs <= budget)
+    capacity = remaining.clip(min=0)
+    pair_scores = (flight_values[flight_front][:, None] + hotel_values[hotel_front][None, :]
+                   + best_value[capacity])
+
+    candidates = [(pair_scores[f, h], -pair_costs[f, h], f, h) for f, h in zip(*np.nonzero(feasible))]
+    bundles = []
+    for score, _, f, h in heapq.nlargest(top_k, candidates):
+        chosen = _chosen_activities(take, activity_weights, int(best_count[capacity[f, h]]), int(capacity[f, h]))
+        flight, hotel = flights[flight_front[f]], hotels[hotel_front[h]]
+        cost = float(flight_costs[flight_front[f]] + hotel_costs[hotel_front[h]] + activity_costs[chosen].sum())
+        bundles.append(TripBundle(flight, hotel, [activities[i] for i in chosen], cost, float(score)))
+
+    bundles.sort(key=lambda bundle: (-bundle.score, bundle.cost))
+    return bundles
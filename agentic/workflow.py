@@ -1,117 +1,322 @@
-from typing import List, Dict
-from .interface import TravelRequest, TravelRecommendation
+from typing import List, Dict, Optional
+from .interface import TravelRequest, TravelRecommendation, Record, Flight, Hotel, Activity
+from .inventory import (INVENTORY_CACHE_PARTITIONS, INVENTORY_DIR, InventoryLoader, columns_from_rows,
+                        destination_slug, records_at)
+import collections
+import heapq
 import random
+import threading
+
+import numpy as np
+
+# Built-in inventory, keyed by destination and category. It is used for destinations
+# missing from the file-backed catalog (see agentic/inventory.py), and destinations
+# with no inventory at all are served from DEFAULT_DESTINATION.
+DEFAULT_DESTINATION = "paris"
+BUILTIN_INVENTORY = {
+    "paris": {
+        "flights": [
+            {"airline": "Air France", "departure": "08:00", "arrival": "10:00", "price": 300.0},
+            {"airline": "Lufthansa", "departure": "10:30", "arrival": "12:30", "price": 350.0},
+            {"airline": "British Airways", "departure": "14:00", "arrival": "16:00", "price": 380.0},
+            {"airline": "KLM", "departure": "16:30", "arrival": "18:30", "price": 320.0},
+            {"airline": "Tarom", "departure": "12:00", "arrival": "14:00", "price": 500.0},
+        ],
+        "hotels": [
+            {"name": "Zoku Paris", "rating": 8.9, "price": 250.0, "type": "Hotel"},
+            {"name": "Villa M", "rating": 8.8, "price": 450.0, "type": "Boutique"},
+            {"name": "Citizen M", "rating": 8.7, "price": 200.0, "type": "Hotel"},
+            {"name": "Generator Paris", "rating": 8.2, "price": 120.0, "type": "Hostel"},
+            {"name": "Le Bristol Paris", "rating": 9.5, "price": 950.0, "type": "Luxury"},
+            {"name": "Airbnb in Le Marais", "rating": 8.6, "price": 180.0, "type": "Apartment"},
+        ],
+        "activities": [
+            {"name": "Louvre Museum", "duration": "3 hours", "price": 17.0, "category": "Art"},
+            {"name": "Eiffel Tower", "duration": "2 hours", "price": 26.8, "category": "Sightseeing"},
+            {"name": "Seine River Cruise", "duration": "1 hour", "price": 15.0, "category": "Relaxation"},
+            {"name": "Montmartre Walking Tour", "duration": "2 hours", "price": 25.0, "category": "History"},
+            {"name": "Cooking Class", "duration": "3 hours", "price": 95.0, "category": "Food"},
+            {"name": "Wine Tasting", "duration": "2 hours", "price": 65.0, "category": "Food"},
+            {"name": "Versailles Palace", "duration": "4 hours", "price": 18.0, "category": "History"},
+            {"name": "Moulin Rouge Show", "duration": "2 hours", "price": 115.0, "category": "Nightlife"},
+            {"name": "Bike Tour", "duration": "3 hours", "price": 35.0, "category": "Sports"},
+            {"name": "Admission to Disneyland Paris", "duration": "Full day", "price": 100.0, "category": "Entertainment"},
+            {"name": "Sightseeing Cruise from the Eiffel Tower", "duration": "1 hour", "price": 75.0, "category": "Sightseeing"},
+        ],
+    }
+}
+
+# Activity categories matching each traveler interest
+INTEREST_CATEGORIES = {
+    "History": ["History"],
+    "Food": ["Food"],
+    "Nature": ["Relaxation", "Sports"],
+    "Shopping": ["Shopping"],
+    "Art": ["Art"],
+    "Nightlife": ["Nightlife"],
+    "Sports": ["Sports"]
+}
+
+# Price adjustment rules applied by the pricing engine: each matching rule multiplies
+# the base price and adds its extra fields to the priced row
+PRICING_RULES = [
+    {"category": "flights", "travel_style": "Luxury", "multiplier": 1.5, "extra": {"class": "Business"}},
+    {"category": "flights", "travel_style": "Budget", "multiplier": 0.8, "extra": {"class": "Economy"}},
+    {"category": "activities", "travel_style": "Luxury", "multiplier": 1.3, "extra": {"type": "Private"}},
+    {"category": "activities", "travel_style": "Budget", "multiplier": 0.9, "extra": {"type": "Group"}},
+]
+
+# Per-traveler surcharges: category -> (travelers included in the base price, surcharge per extra traveler)
+TRAVELER_SURCHARGES = {"hotels": (2, 0.25)}  # 25% increase per additional traveler
+
+# Budget share each category's unit price is compared against
+BUDGET_SHARES = {"flights": 1.0, "hotels": 1 / 5, "activities": 1 / 10}  # 5-night stay, ~10 activities
+
+# Secondary index field per category (hotels by accommodation type, activities by category)
+INDEXED_FIELDS = {"hotels": "type", "activities": "category"}
+
+class PricingEngine:
+    """
+    Vectorized pricing of inventory rows
+
+    Multipliers come from a rule table (travel style rules and per-traveler
+    surcharges), and whole columns of base prices are repriced and checked
+    against the budget in one NumPy pass, for one request or many at once.
+    """
+
+    def __init__(self, rules: List[Dict], traveler_surcharges: Dict[str, tuple]):
+        self.rules = rules
+        self.traveler_surcharges = traveler_surcharges
+
+    def adjustments(self, category: str, request: TravelRequest) -> tuple:
+        """
+        Return the combined price multiplier and extra fields for a request
+
+        Returns:
+            tuple: (multiplier, extra fields dict)
+        """
+        multiplier, extra = 1.0, {}
+        for rule in self.rules:
+            if rule["category"] == category and rule["travel_style"] == request.travel_style:
+                multiplier *= rule["multiplier"]
+                extra.update(rule["extra"])
+
+        if category in self.traveler_surcharges:
+            included, surcharge = self.traveler_surcharges[category]
+            if request.travelers > included:
+                multiplier *= 1 + (request.travelers - included) * surcharge
+        return multiplier, extra
+
+    def limit(self, category: str, request: TravelRequest) -> float:
+        """Return the unit-price limit for a category under the request's budget."""
+        return request.budget * BUDGET_SHARES[category]
+
+    def price(self, base_prices: np.ndarray, multiplier: float, limit: float) -> tuple:
+        """
+        Reprice a column of base prices and mask the rows within the limit
+
+        Returns:
+            tuple: (adjusted prices array, boolean mask array)
+        """
+        adjusted = base_prices * multiplier
+        return adjusted, adjusted <= limit
+
+    def price_many(self, category: str, base_prices: np.ndarray, requests: List[TravelRequest]) -> tuple:
+        """
+        Reprice one column for many requests at once
+
+        Returns:
+            tuple: (adjusted prices, budget masks), both shaped (len(requests), len(base_prices))
+        """
+        multipliers = np.array([self.adjustments(category, request)[0] for request in requests])
+        limits = np.array([self.limit(category, request) for request in requests])
+        adjusted = multipliers[:, None] * base_prices[None, :]
+        return adjusted, adjusted <= limits[:, None]
+
+pricing_engine = PricingEngine(PRICING_RULES, TRAVELER_SURCHARGES)
+
+class InventoryPartition:
+    """
+    Rows of one destination and category, held as price-sorted columns
+
+    A secondary-index partition shares its parent's columns and keeps only
+    the (price-ordered) row indices of its group. Records are built just for
+    the rows a query returns.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], category: str, indices: Optional[np.ndarray] = None):
+        self.columns = columns
+        self.category = category
+        self.indices = indices
+        self.prices = columns["price"] if indices is None else columns["price"][indices]
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def within(self, limit: float, multiplier: float = 1.0, extra: Optional[Dict] = None) -> List[Record]:
+        """
+        Return priced records (with any extra fields set) of the rows whose price times multiplier is at most limit
+
+        A binary search on limit / multiplier (with a little slack for
+        rounding) bounds the candidates; the pricing engine then reprices
+        just that prefix and masks it exactly.
+        """
+        count = int(np.searchsorted(self.prices, limit / multiplier * (1 + 1e-9), side="right"))
+        adjusted, mask = pricing_engine.price(self.prices[:count], multiplier, limit)
+        rows = np.arange(count) if self.indices is None else self.indices[:count]
+        return records_at(self.columns, self.category, rows[mask], price=adjusted[mask], **(extra or {}))
+
+def _index_partitions(categories: Dict[str, Dict[str, np.ndarray]]) -> Dict[tuple, InventoryPartition]:
+    """Build the full and secondary-index partitions of one destination."""
+    partitions = {}
+    for category, columns in categories.items():
+        partitions[(category, None)] = InventoryPartition(columns, category)
+
+        field = INDEXED_FIELDS.get(category)
+        if field and len(columns[field]):
+            values, groups = np.unique(np.char.lower(np.asarray(columns[field])), return_inverse=True)
+            for group, value in enumerate(values):
+                partitions[(category, str(value))] = InventoryPartition(columns, category,
+                                                                        np.flatnonzero(groups == group))
+    return partitions
+
+class InventoryStore:
+    """
+    Flight, hotel and activity inventory with lazily loaded destination partitions
+
+    Destinations are read from the file-backed catalog on first access (or
+    from the built-in inventory) and indexed into price-sorted partitions,
+    with secondary partitions per hotel type and activity category, so a
+    budget filter costs O(log n + k). At most max_partitions destinations
+    stay loaded; the least recently used one is evicted first. Destinations
+    without inventory are served from DEFAULT_DESTINATION.
+    """
+
+    def __init__(self, builtin: Dict[str, Dict[str, List[Dict]]], loader: Optional[InventoryLoader] = None,
+                 max_partitions: int = INVENTORY_CACHE_PARTITIONS):
+        self.builtin = builtin
+        self.loader = loader
+        self.max_partitions = max_partitions
+        self._destinations = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, destination: str) -> Optional[Dict[tuple, InventoryPartition]]:
+        """Read and index a destination, or return None if there is no inventory for it."""
+        categories = self.loader.load(destination) if self.loader is not None else None
+        if categories is None and destination in self.builtin:
+            categories = {category: columns_from_rows(rows, category)
+                          for category, rows in self.builtin[destination].items()}
+        return _index_partitions(categories) if categories is not None else None
+
+    def _has_inventory(self, destination: str) -> bool:
+        return destination in self.builtin or (self.loader is not None and self.loader.has_destination(destination))
+
+    def _destination_partitions(self, destination: str) -> Dict[tuple, InventoryPartition]:
+        """Return the loaded partitions of a destination, loading (or falling back) on a miss."""
+        destination = destination_slug(destination)
+        if destination not in self._destinations and not self._has_inventory(destination):
+            destination = DEFAULT_DESTINATION
+
+        with self._lock:
+            partitions = self._destinations.get(destination)
+            if partitions is not None:
+                self._destinations.move_to_end(destination)
+                return partitions
+
+        partitions = self._load(destination)
+        if partitions is None and destination != DEFAULT_DESTINATION:
+            return self._destination_partitions(DEFAULT_DESTINATION)
+        partitions = partitions or {}
+
+        with self._lock:
+            self._destinations[destination] = partitions
+            self._destinations.move_to_end(destination)
+            while len(self._destinations) > self.max_partitions:
+                self._destinations.popitem(last=False)
+        return partitions
+
+    def partition(self, destination: str, category: str, value: Optional[str] = None) -> Optional[InventoryPartition]:
+        """
+        Return the partition for a destination and category
+
+        Args:
+            destination (str): Trip destination
+            category (str): "flights", "hotels" or "activities"
+            value (str, optional): Secondary index value (hotel type or activity category)
+
+        Returns:
+            InventoryPartition: The partition, or None if no rows match
+        """
+        return self._destination_partitions(destination).get((category, value.lower() if value else None))
+
+    def loaded_destinations(self) -> List[str]:
+        """Return the destinations currently loaded, least recently used first."""
+        with self._lock:
+            return list(self._destinations)
+
+_inventory_store = None
+_inventory_lock = threading.Lock()
+
+def get_inventory_store() -> InventoryStore:
+    """Return the process-wide inventory store, creating it on first use."""
+    global _inventory_store
+    if _inventory_store is None:
+        with _inventory_lock:
+            if _inventory_store is None:
+                _inventory_store = InventoryStore(BUILTIN_INVENTORY, InventoryLoader(INVENTORY_DIR))
+    return _inventory_store
+
+def _priced(partitions: List[InventoryPartition], category: str, request: TravelRequest) -> List[Record]:
+    """Price the partitions for the request, keep the rows within budget and merge them cheapest first."""
+    multiplier, extra = pricing_engine.adjustments(category, request)
+    limit = pricing_engine.limit(category, request)
+    return list(heapq.merge(*(partition.within(limit, multiplier, extra) for partition in partitions),
+                            key=lambda row: row.price))
+
+def get_flights(request: TravelRequest) -> List[Flight]:
+    """Retrieve flight options based on the travel request, cheapest first."""
+    flights = get_inventory_store().partition(request.destination, "flights")
+    if flights is None:
+        return []
+
+    # Adjust prices based on travel style and filter them based on budget
+    return _priced([flights], "flights", request)
+
+def get_hotels(request: TravelRequest) -> List[Hotel]:
+    """Retrieve hotel options based on the travel request, cheapest first."""
+    store = get_inventory_store()
 
-def get_flights(request: TravelRequest) -> List[Dict]:
-    """Retrieve flight options based on the travel request."""
-    # Simulate retrieving flight information from an API
-    destination = request.destination.lower()
-
-    # Base flights data
-    flights = [
-        {"airline": "Air France", "departure": "08:00", "arrival": "10:00", "price": 300.0},
-        {"airline": "Lufthansa", "departure": "10:30", "arrival": "12:30", "price": 350.0},
-        {"airline": "British Airways", "departure": "14:00", "arrival": "16:00", "price": 380.0},
-        {"airline": "KLM", "departure": "16:30", "arrival": "18:30", "price": 320.0},
-        {"airline": "Tarom", "departure": "12:00", "arrival": "14:00", "price": 500.0},
-    ]
+    # Adjust based on accommodation preference
+    hotels = store.partition(request.destination, "hotels", request.accommodation_type)
+    if hotels is None:
+        hotels = store.partition(request.destination, "hotels")
+    if hotels is None:
+        return []
 
-    # Adjust prices based on travel style
-    if request.travel_style == "Luxury":
-        for flight in flights:
-            flight["price"] *= 1.5
-            flight["class"] = "Business"
-    elif request.travel_style == "Budget":
-        for flight in flights:
-            flight["price"] *= 0.8
-            flight["class"] = "Economy"
-
-    # Filter flights based on budget
-    return [flight for flight in flights if flight["price"] <= request.budget]
-
-def get_hotels(request: TravelRequest) -> List[Dict]:
-    """Retrieve hotel options based on the travel request."""
-    # Simulate retrieving hotel information from an API
-    destination = request.destination.lower()
-
-    # Base hotels data
-    hotels = [
-        {"name": "Zoku Paris", "rating": 8.9, "price": 250.0, "type": "Hotel"},
-        {"name": "Villa M", "rating": 8.8, "price": 450.0, "type": "Boutique"},
-        {"name": "Citizen M", "rating": 8.7, "price": 200.0, "type": "Hotel"},
-        {"name": "Generator Paris", "rating": 8.2, "price": 120.0, "type": "Hostel"},
-        {"name": "Le Bristol Paris", "rating": 9.5, "price": 950.0, "type": "Luxury"},
-        {"name": "Airbnb in Le Marais", "rating": 8.6, "price": 180.0, "type": "Apartment"},
-    ]
+    # Adjust prices based on number of travelers and filter them based on budget (per night)
+    return _priced([hotels], "hotels", request)
 
-    # Adjust based on accommodation preference
-    preferred_hotels = [hotel for hotel in hotels if hotel["type"].lower() == request.accommodation_type.lower()]
-    if not preferred_hotels:
-        preferred_hotels = hotels
-
-    # Adjust prices based on number of travelers
-    for hotel in preferred_hotels:
-        if request.travelers > 2:
-            hotel["price"] *= (1 + (request.travelers - 2) * 0.25)  # 25% increase per additional traveler
-
-    # Filter hotels based on budget (per night)
-    return [hotel for hotel in preferred_hotels if hotel["price"] <= request.budget / 5]  # Assuming 5-night stay
-
-def get_activities(request: TravelRequest) -> List[Dict]:
-    """Retrieve activity options based on the travel request."""
-    # Simulate retrieving activity information from an API
-    destination = request.destination.lower()
-
-    # Base activities data for Paris
-    activities = [
-        {"name": "Louvre Museum", "duration": "3 hours", "price": 17.0, "category": "Art"},
-        {"name": "Eiffel Tower", "duration": "2 hours", "price": 26.8, "category": "Sightseeing"},
-        {"name": "Seine River Cruise", "duration": "1 hour", "price": 15.0, "category": "Relaxation"},
-        {"name": "Montmartre Walking Tour", "duration": "2 hours", "price": 25.0, "category": "History"},
-        {"name": "Cooking Class", "duration": "3 hours", "price": 95.0, "category": "Food"},
-        {"name": "Wine Tasting", "duration": "2 hours", "price": 65.0, "category": "Food"},
-        {"name": "Versailles Palace", "duration": "4 hours", "price": 18.0, "category": "History"},
-        {"name": "Moulin Rouge Show", "duration": "2 hours", "price": 115.0, "category": "Nightlife"},
-        {"name": "Bike Tour", "duration": "3 hours", "price": 35.0, "category": "Sports"},
-        {"name": "Admission to Disneyland Paris", "duration": "Full day", "price": 100.0, "category": "Entertainment"},
-        {"name": "Sightseeing Cruise from the Eiffel Tower", "duration": "1 hour", "price": 75.0, "category": "Sightseeing"},
-    ]
+def get_activities(request: TravelRequest) -> List[Activity]:
+    """Retrieve activity options based on the travel request, cheapest first."""
+    store = get_inventory_store()
 
     # Filter based on interests if provided
+    partitions = []
     if request.interests:
-        interest_categories = {
-            "History": ["History"],
-            "Food": ["Food"],
-            "Nature": ["Relaxation", "Sports"],
-            "Shopping": ["Shopping"],
-            "Art": ["Art"],
-            "Nightlife": ["Nightlife"],
-            "Sports": ["Sports"]
-        }
-
         relevant_categories = []
         for interest in request.interests:
-            if interest in interest_categories:
-                relevant_categories.extend(interest_categories[interest])
-
-        if relevant_categories:
-            filtered_activities = [activity for activity in activities
-                                  if activity["category"] in relevant_categories]
-            if filtered_activities:
-                activities = filtered_activities
-
-    # Adjust prices based on travel style
-    if request.travel_style == "Luxury":
-        for activity in activities:
-            activity["price"] *= 1.3
-            activity["type"] = "Private"
-    elif request.travel_style == "Budget":
-        for activity in activities:
-            activity["price"] *= 0.9
-            activity["type"] = "Group"
-
-    # Filter activities based on budget
-    return [activity for activity in activities if activity["price"] <= request.budget / 10]  # Assuming ~10 activities
+            relevant_categories.extend(INTEREST_CATEGORIES.get(interest, []))
+        partitions = [partition for partition in
+                      (store.partition(request.destination, "activities", category)
+                       for category in dict.fromkeys(relevant_categories))
+                      if partition is not None]
+
+    if not partitions:
+        partition = store.partition(request.destination, "activities")
+        partitions = [partition] if partition is not None else []
+
+    # Adjust prices based on travel style and filter them based on budget
+    return _priced(partitions, "activities", request)
 
 def generate_weather_forecast(dates: str) -> List[Dict]:
     """Generate a weather forecast for the given dates."""
@@ -217,7 +422,12 @@ def travel_recommendation(request: TravelRequest) -> TravelRecommendation:
     # In a real implementation, this would call an LLM to generate the travel plan
     travel_plan = f"Your personalized travel plan for {request.destination} would be generated here."
 
-    return TravelRecommendation(flights, hotels, activities, travel_plan)
+    # Activity categories matching the traveler's interests, used to rank trip bundles
+    preferred_categories = [category for interest in request.interests
+                            for category in INTEREST_CATEGORIES.get(interest, [])]
+
+    return TravelRecommendation(flights, hotels, activities, travel_plan,
+                                budget=request.budget, preferred_categories=preferred_categories)
 
 def enrich_travel_recommendation(recommendation: TravelRecommendation, destination: str) -> TravelRecommendation:
     """Enrich travel recommendation with data from search API."""
@@ -229,17 +439,17 @@ def enrich_travel_recommendation(recommendation: TravelRecommendation, destinati
     # Convert to the format used in the app
     for api_attraction in api_attractions:
         # Create a new activity from the API data
-        new_activity = {
-            "name": api_attraction["name"],
-            "duration": "2 hours",  # Default duration
-            "price": 0.0,  # Price unknown from API
-            "category": "Sightseeing",
-            "rating": api_attraction["rating"],
-            "description": api_attraction["description"]
-        }
+        new_activity = Activity(
+            name=api_attraction["name"],
+            duration="2 hours",  # Default duration
+            price=0.0,  # Price unknown from API
+            category="Sightseeing",
+            rating=api_attraction["rating"] if isinstance(api_attraction["rating"], (int, float)) else None,  # "N/A" when unrated
+            description=api_attraction["description"]
+        )
 
         # Add to activities if not already present
-        if not any(activity["name"] == new_activity["name"] for activity in recommendation.activities):
+        if not any(activity.name == new_activity.name for activity in recommendation.activities):
             recommendation.activities.append(new_activity)
 
     return recommendation
\ No newline at end of file
@@ -5,17 +5,16 @@ import re
 import datetime
 from agentic.interface import TravelRequest
 from agentic.workflow import get_flights, get_hotels, get_activities
-from langchain_integration import generate_travel_plan
+from langchain_integration import stream_travel_plan
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
+from concurrent.futures import ThreadPoolExecutor
 from search_api import (
-    get_destination_images,
-    get_destination_attractions,
-    get_destination_news
+    get_destination_bundle
 )
 
 def create_pdf(content, destination, dates, budget, hotels, flights, activities):
@@ -365,6 +364,11 @@ def create_pdf(content, destination, dates, budget, hotels, flights, activities)
     buffer.seek(0)
     return buffer
 
+@st.cache_resource
+def get_pipeline_executor():
+    """Shared worker pool for the concurrent stages of the Generate handler."""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="travel-pipeline")
+
 def main():
     st.set_page_config(page_title="Travel Recommendation System", layout="wide")
 
@@ -404,46 +408,6 @@ def main():
             # Create a travel request
             request = TravelRequest(destination, dates, budget)
 
-            # Get recommendations using the agentic workflow
-            flights = get_flights(request)
-            hotels = get_hotels(request)
-            activities = get_activities(request)
-
-            # Generate a travel plan using LangChain
-            travel_plan = generate_travel_plan(destination, dates, budget)
-
-            st.success("🎉 Your travel plan is ready!")
-            st.markdown("---")
-
-            # Display recommendations with enhanced visuals
-            st.subheader("✈️ Flight Options")
-            st.caption("Best flight options based on price and convenience")
-            for flight in flights:
-                st.write(f"**{flight['airline']}**: ${flight['price']} "
-                         f"(🛫 Departure: {flight['departure']}, 🛬 Arrival: {flight['arrival']})")
-
-            st.markdown("---")
-            st.subheader("🏨 Accommodation Options")
-            st.caption("Places to stay that match your preferences")
-            for hotel in hotels:
-                st.write(f"**{hotel['name']}**: 💵 ${hotel['price']} per night (⭐ Rating: {hotel['rating']}/5)")
-
-            st.markdown("---")
-            st.subheader("🎭 Recommended Activities")
-            st.caption("Exciting things to do at your destination")
-            for activity in activities:
-                st.write(f"**{activity['name']}**: 💵 ${activity['price']} (⏱️ {activity['duration']})")
-
-            st.markdown("---")
-            st.subheader("📋 Your Personalized Itinerary")
-            st.info("🤖 AI-Generated Travel Plan")
-            st.write(travel_plan)
-
-            # Weather forecast
-            st.markdown("---")
-            st.subheader("☀️ Weather Forecast")
-            st.caption(f"Expected weather in {destination} during your stay ({dates})")
-
             # Import required libraries for weather API
             import requests
             from datetime import datetime, timedelta
@@ -456,10 +420,16 @@ def main():
             # Load environment variables
             load_dotenv()
 
+            # Warnings raised while fetching the forecast on a worker thread, shown once it is joined
+            weather_warnings = []
+
             def get_weather_forecast_openweathermap(city, start_date, end_date):
                 """
                 Get weather forecast for a city between two dates using OpenWeatherMap API
 
+                Runs on a worker thread, so problems are collected in weather_warnings
+                instead of being written to the page directly.
+
                 Args:
                     city (str): City name
                     start_date (datetime): Start date
@@ -473,16 +443,16 @@ def main():
                     api_key = os.getenv("OPENWEATHER_API_KEY")
 
                     if not api_key:
-                        st.warning("OpenWeatherMap API key not found. Using historical averages instead.")
+                        weather_warnings.append("OpenWeatherMap API key not found. Using historical averages instead.")
                         return None
 
                     # Get coordinates for the city using OpenWeatherMap Geocoding API
                     geocoding_url = f"http://api.openweathermap.org/geo/1.0/direct?q={city}&limit=1&appid={api_key}"
-                    geo_response = requests.get(geocoding_url)
+                    geo_response = requests.get(geocoding_url, timeout=10)
                     geo_data = geo_response.json()
 
                     if not geo_data:
-                        st.warning(f"Could not find coordinates for {city}. Using historical averages instead.")
+                        weather_warnings.append(f"Could not find coordinates for {city}. Using historical averages instead.")
                         return None
 
                     lat = geo_data[0]['lat']
@@ -490,11 +460,11 @@ def main():
 
                     # Get 5-day forecast using OpenWeatherMap 5 day / 3 hour forecast API
                     forecast_url = f"https://api.openweathermap.org/data/2.5/forecast?lat={lat}&lon={lon}&units=metric&appid={api_key}"
-                    forecast_response = requests.get(forecast_url)
+                    forecast_response = requests.get(forecast_url, timeout=10)
                     forecast_data = forecast_response.json()
 
                     if forecast_data.get('cod') != '200':
-                        st.warning(f"Error fetching weather data: {forecast_data.get('message')}. Using historical averages instead.")
+                        weather_warnings.append(f"Error fetching weather data: {forecast_data.get('message')}. Using historical averages instead.")
                         return None
 
                     # Process forecast data
@@ -595,7 +565,7 @@ def main():
                     return weather_data
 
                 except Exception as e:
-                    st.warning(f"Error fetching weather data: {str(e)}. Using historical averages instead.")
+                    weather_warnings.append(f"Error fetching weather data: {str(e)}. Using historical averages instead.")
                     return None
 
             # Function to parse travel dates with better error handling
@@ -664,6 +634,62 @@ def main():
                         current_date.month
                     )
 
+            # Start the independent stages together: the agentic workflow lookups and the
+            # weather forecast run on the worker pool while the travel plan streams below
+            pipeline_executor = get_pipeline_executor()
+            travel_dates = parse_travel_dates(dates)
+            flights_future = pipeline_executor.submit(get_flights, request)
+            hotels_future = pipeline_executor.submit(get_hotels, request)
+            activities_future = pipeline_executor.submit(get_activities, request)
+            weather_future = pipeline_executor.submit(
+                get_weather_forecast_openweathermap, destination, travel_dates[0], travel_dates[1]
+            )
+
+            # Get recommendations using the agentic workflow
+            flights = flights_future.result()
+            hotels = hotels_future.result()
+            activities = activities_future.result()
+
+            st.markdown("---")
+
+            # Display recommendations with enhanced visuals
+            st.subheader("✈️ Flight Options")
+            st.caption("Best flight options based on price and convenience")
+            for flight in flights:
+                st.write(f"**{flight['airline']}**: ${flight['price']} "
+                         f"(🛫 Departure: {flight['departure']}, 🛬 Arrival: {flight['arrival']})")
+
+            st.markdown("---")
+            st.subheader("🏨 Accommodation Options")
+            st.caption("Places to stay that match your preferences")
+            for hotel in hotels:
+                st.write(f"**{hotel['name']}**: 💵 ${hotel['price']} per night (⭐ Rating: {hotel['rating']}/5)")
+
+            st.markdown("---")
+            st.subheader("🎭 Recommended Activities")
+            st.caption("Exciting things to do at your destination")
+            for activity in activities:
+                st.write(f"**{activity['name']}**: 💵 ${activity['price']} (⏱️ {activity['duration']})")
+
+            st.markdown("---")
+            st.subheader("📋 Your Personalized Itinerary")
+            st.info("🤖 AI-Generated Travel Plan")
+
+            # Stream the LangChain travel plan as it is generated; the full text is kept for the PDF.
+            # The previous plan's sections are kept per session so an input change only
+            # regenerates the sections it affects.
+            if 'plan_state' not in st.session_state:
+                st.session_state.plan_state = {}
+            travel_plan = st.write_stream(
+                stream_travel_plan(destination, dates, budget, state=st.session_state.plan_state)
+            )
+            st.success("🎉 Your travel plan is ready!")
+
+            # Weather forecast
+            st.markdown("---")
+            st.subheader("☀️ Weather Forecast")
+            st.caption(f"Expected weather in {destination} during your stay ({dates})")
+
             # Get historical weather data for a destination and month
             def get_historical_weather(destination, month_num):
                 """
@@ -750,11 +776,13 @@ def main():
 
             # Try to parse the travel dates
             try:
-                # Use the improved date parsing function
-                start_date, end_date, month_num = parse_travel_dates(dates)
+                # Use the dates parsed when the pipeline started
+                start_date, end_date, month_num = travel_dates
 
-                # Get weather forecast from OpenWeatherMap API
-                weather_data = get_weather_forecast_openweathermap(destination, start_date, end_date)
+                # Join the OpenWeatherMap forecast that was fetched alongside the travel plan
+                weather_data = weather_future.result()
+                for warning in weather_warnings:
+                    st.warning(warning)
 
                 # If API call failed or returned no data, use historical averages
                 if not weather_data:
@@ -1381,7 +1409,9 @@ def main():
         # Add view style selector
         view_style = st.radio("Gallery Style:", ["Grid View", "Carousel", "Fullscreen"], horizontal=True)
 
-        images = get_destination_images(destination, category=selected_category, time_filter=time_filter)
+        # Fetch images, attractions and news for all three tabs in one concurrent batch
+        destination_bundle = get_destination_bundle(destination, category=selected_category, time_filter=time_filter)
+        images = destination_bundle["images"]
 
         if not images:
             st.info("No images available. Please check your API key configuration.")
@@ -2748,7 +2778,7 @@ def main():
 
     with search_tabs[1]:  # Attractions tab
         st.subheader(f"Top Attractions in {destination}")
-        attractions = get_destination_attractions(destination)
+        attractions = destination_bundle["attractions"]
 
         if not attractions:
             st.info("No attraction information available. Please check your API key configuration.")
@@ -3028,7 +3058,7 @@ def main():
 
     with search_tabs[2]:  # News tab
         st.subheader(f"Latest News about {destination}")
-        news_items = get_destination_news(destination)
+        news_items = destination_bundle["news"]
 
         if not news_items:
             st.info("No news available. Please check your API key configuration.")
@@ -0,0 +1,160 @@
+# benchmark.py
+"""
+Latency benchmark for the Generate pipeline
+
+Drives N concurrent simulated users through the same steps the Streamlit
+Generate button runs and reports p50/p95/p99 latency per stage. By default
+the plan is produced by the fake chat model (TRAVEL_LLM_PROVIDER=fake) with
+the plan cache disabled, so runs are repeatable and cost no quota:
+
+    python benchmark.py --users 20 --iterations 5
+    python benchmark.py --users 20 --token-rate 80 --first-token-delay 1.5 --error-rate 0.05
+
+Pass --provider gemini to measure the real model instead.
+"""
+import argparse
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Configure logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Destinations and date ranges the simulated users cycle through
+BENCHMARK_DESTINATIONS = ["Paris", "Rome", "Barcelona", "Lisbon", "Vienna", "Prague", "Amsterdam", "Athens"]
+BENCHMARK_DATES = ["December 5-9, 2025", "May 1-3, 2026", "July 10-20, 2026", "October 2-8, 2026"]
+
+# Stages reported, in pipeline order
+STAGES = ["search", "workflow", "plan_first_chunk", "plan_total", "end_to_end"]
+
+def percentile(values, pct):
+    """Return the nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def configure_environment(args):
+    """Set the LLM and cache configuration before the pipeline modules are imported."""
+    os.environ["TRAVEL_LLM_PROVIDER"] = args.provider
+    os.environ["FAKE_LLM_TOKENS_PER_SECOND"] = str(args.token_rate)
+    os.environ["FAKE_LLM_FIRST_TOKEN_DELAY"] = str(args.first_token_delay)
+    os.environ["FAKE_LLM_ERROR_RATE"] = str(args.error_rate)
+    os.environ["FAKE_LLM_SEED"] = str(args.seed)
+    if not args.use_cache:
+        os.environ["PLAN_CACHE_PATH"] = ""
+    if args.section_mode:
+        os.environ["PLAN_SECTION_MODE"] = "true"
+
+def run_request(user, iteration, args, timings, errors, lock):
+    """Run one simulated Generate request and record its stage latencies."""
+    from agentic.interface import TravelRequest
+    from agentic.workflow import get_flights, get_hotels, get_activities
+    from langchain_integration import PLAN_FAILURE_MESSAGES, stream_travel_plan
+
+    request_number = user * args.iterations + iteration
+    destination = BENCHMARK_DESTINATIONS[request_number % len(BENCHMARK_DESTINATIONS)]
+    dates = BENCHMARK_DATES[request_number % len(BENCHMARK_DATES)]
+    # Distinct budgets keep concurrent users from sharing cached plans when caching is on
+    budget = 1000 + 250 * request_number
+
+    stage_times = {}
+    started = time.monotonic()
+
+    if args.with_search:
+        from search_api import get_destination_bundle
+        stage_started = time.monotonic()
+        get_destination_bundle(destination)
+        stage_times["search"] = time.monotonic() - stage_started
+
+    stage_started = time.monotonic()
+    request = TravelRequest(destination, dates, budget)
+    get_flights(request)
+    get_hotels(request)
+    get_activities(request)
+    stage_times["workflow"] = time.monotonic() - stage_started
+
+    stage_started = time.monotonic()
+    chunks = []
+    for chunk in stream_travel_plan(destination, dates, budget):
+        if not chunks:
+            stage_times["plan_first_chunk"] = time.monotonic() - stage_started
+        chunks.append(chunk)
+    finished = time.monotonic()
+    stage_times["plan_total"] = finished - stage_started
+    stage_times["end_to_end"] = finished - started
+
+    travel_plan = "".join(chunks)
+    failed = any(message in travel_plan for message in PLAN_FAILURE_MESSAGES)
+    with lock:
+        for stage, seconds in stage_times.items():
+            timings[stage].append(seconds)
+        if failed:
+            errors.append(request_number)
+
+def run_user(user, args, timings, errors, lock):
+    """Run one simulated user's requests back to back, pausing for think time between them."""
+    for iteration in range(args.iterations):
+        if iteration and args.think_time > 0:
+            time.sleep(args.think_time)
+        try:
+            run_request(user, iteration, args, timings, errors, lock)
+        except Exception as e:
+            logger.error(f"User {user} request {iteration} raised: {str(e)}")
+            with lock:
+                errors.append(user * args.iterations + iteration)
+
+def report(timings, errors, total_requests, wall_time):
+    """Print a per-stage latency table."""
+    print(f"{total_requests} requests in {wall_time:.2f}s "
+          f"({total_requests / wall_time:.2f} req/s), {len(errors)} failed")
+    print(f"{'stage':<18}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for stage in STAGES:
+        values = timings.get(stage)
+        if not values:
+            continue
+        print(f"{stage:<18}{len(values):>7}{percentile(values, 50):>10.3f}{percentile(values, 95):>10.3f}"
+              f"{percentile(values, 99):>10.3f}{max(values):>10.3f}")
+
+    from langchain_integration import get_llm_scheduler_stats
+    stats = get_llm_scheduler_stats()
+    print(f"LLM scheduler: {stats['admitted']} admitted, {stats['rejected']} rejected, "
+          f"{stats['timed_out']} timed out, queue p95 {stats.get('queue_time_p95', 0):.3f}s")
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the Generate pipeline with simulated users.")
+    parser.add_argument("--users", type=int, default=10, help="number of concurrent simulated users")
+    parser.add_argument("--iterations", type=int, default=3, help="requests per user")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds each user waits between requests")
+    parser.add_argument("--provider", default="fake", choices=["fake", "gemini"], help="chat model backend")
+    parser.add_argument("--token-rate", type=float, default=150.0, help="fake model tokens per second")
+    parser.add_argument("--first-token-delay", type=float, default=0.8, help="fake model first-token delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of fake model calls that fail")
+    parser.add_argument("--seed", type=int, default=0, help="seed for fake model error injection")
+    parser.add_argument("--section-mode", action="store_true", help="generate plans section by section")
+    parser.add_argument("--with-search", action="store_true", help="include the Serper destination lookups")
+    parser.add_argument("--use-cache", action="store_true", help="keep the plan cache enabled")
+    args = parser.parse_args(argv)
+
+    configure_environment(args)
+
+    timings = defaultdict(list)
+    errors = []
+    lock = threading.Lock()
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.users, thread_name_prefix="bench-user") as executor:
+        for user in range(args.users):
+            executor.submit(run_user, user, args, timings, errors, lock)
+    wall_time = time.monotonic() - started
+
+    report(timings, errors, args.users * args.iterations, wall_time)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
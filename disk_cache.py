@@ -0,0 +1,201 @@
+# disk_cache.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class DiskCache:
+    """
+    SQLite-backed cache of JSON-serializable values that survives process restarts
+
+    Payloads are stored zlib-compressed, expired entries are dropped when they
+    are read, and a compaction pass keeps the file under max_bytes by removing
+    expired entries first and then the least recently used ones.
+    """
+
+    def __init__(self, path, max_bytes, compact_every=200):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path (str): Location of the SQLite file
+            max_bytes (int): Upper bound for the total size of stored payloads
+            compact_every (int): Number of writes between compaction passes
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache (last_access)")
+        self._conn.commit()
+
+        # Drop anything that expired while the process was down
+        self.compact()
+
+    def get_entry(self, key):
+        """
+        Return the cached value together with its expiry time
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            tuple: (value, expires_at), or None if the key is missing or expired
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT payload, expires_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                payload, expires_at = row
+                if expires_at <= now:
+                    # Expire on read
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self.misses += 1
+                    return None
+
+                self._conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self.hits += 1
+
+            return json.loads(zlib.decompress(payload)), expires_at
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            logger.warning(f"Disk cache read failed: {str(e)}")
+            return None
+
+    def get(self, key):
+        """Return the cached value for key, or None if it is missing or expired."""
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key, value, ttl):
+        """
+        Store a value for ttl seconds
+
+        Args:
+            key (str): Cache key
+            value: JSON-serializable value
+            ttl (float): Time to live in seconds
+        """
+        if ttl <= 0:
+            return
+
+        try:
+            payload = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+            if len(payload) > self.max_bytes:
+                return
+
+            now = time.time()
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, payload, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, len(payload), now + ttl, now)
+                )
+                self._conn.commit()
+                self._writes += 1
+                should_compact = self._writes % self.compact_every == 0
+
+            if should_compact:
+                self.compact()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Disk cache write failed: {str(e)}")
+
+    def compact(self):
+        """Remove expired entries, then evict least recently used ones until under the size limit."""
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+                total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+                if total > self.max_bytes:
+                    # Shrink to 90% of the limit so compaction doesn't run on every write
+                    target = int(self.max_bytes * 0.9)
+                    evicted = 0
+                    for key, size in self._conn.execute(
+                        "SELECT key, size FROM cache ORDER BY last_access ASC"
+                    ).fetchall():
+                        if total <= target:
+                            break
+                        self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                        total -= size
+                        evicted += 1
+                    logger.info(f"Disk cache compaction evicted {evicted} entries from {self.path}")
+
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache compaction failed: {str(e)}")
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+            ).fetchone()
+            return {
+                "path": self.path,
+                "entries": entries,
+                "bytes": total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+def open_disk_cache(path, max_bytes):
+    """
+    Open a disk cache, returning None if it is disabled or cannot be opened
+
+    Args:
+        path (str): Location of the SQLite file; an empty value disables the cache
+        max_bytes (int): Upper bound for the total size of stored payloads
+
+    Returns:
+        DiskCache: The opened cache, or None
+    """
+    if not path:
+        return None
+
+    try:
+        return DiskCache(path, max_bytes)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Disk cache at {path} is unavailable, continuing without it: {str(e)}")
+        return None
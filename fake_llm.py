@@ -0,0 +1,116 @@
+# fake_llm.py
+import hashlib
+import os
+import random
+import threading
+import time
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+# Defaults for the simulated model, roughly in line with gemini-2.5-flash
+FAKE_LLM_TOKENS_PER_SECOND = float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "150"))
+FAKE_LLM_FIRST_TOKEN_DELAY = float(os.getenv("FAKE_LLM_FIRST_TOKEN_DELAY", "0.8"))
+FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+FAKE_LLM_FILL_RATIO = float(os.getenv("FAKE_LLM_FILL_RATIO", "0.8"))
+FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "0"))
+
+# Tokens emitted per streamed chunk
+CHUNK_TOKENS = 8
+
+class ServiceUnavailable(Exception):
+    """Injected failure; named like the Gemini error so it takes the transient-error path."""
+
+class FakeTravelChatModel(BaseChatModel):
+    """
+    Deterministic local stand-in for the Gemini chat model
+
+    Replies echo the markdown headings of the prompt followed by placeholder
+    bullets, filling fill_ratio of max_output_tokens. Latency is simulated
+    with a first-token delay and a fixed token rate, and a seeded fraction
+    of calls fails with ServiceUnavailable. Select it with
+    TRAVEL_LLM_PROVIDER=fake to load-test without spending quota.
+    """
+
+    max_output_tokens: int = 2048
+    tokens_per_second: float = FAKE_LLM_TOKENS_PER_SECOND
+    first_token_delay: float = FAKE_LLM_FIRST_TOKEN_DELAY
+    error_rate: float = FAKE_LLM_ERROR_RATE
+    fill_ratio: float = FAKE_LLM_FILL_RATIO
+    seed: int = FAKE_LLM_SEED
+
+    _random: Any = PrivateAttr(default=None)
+    _random_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-travel-chat"
+
+    def _should_fail(self) -> bool:
+        """Draw from the seeded error-injection sequence."""
+        if self.error_rate <= 0:
+            return False
+        with self._random_lock:
+            if self._random is None:
+                self._random = random.Random(self.seed)
+            return self._random.random() < self.error_rate
+
+    def _reply_tokens(self, messages: List[BaseMessage]) -> List[str]:
+        """Build the deterministic reply for a prompt as a list of whitespace-delimited tokens."""
+        prompt = "\n".join(str(message.content) for message in messages)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        headings = [line.strip() for line in prompt.splitlines() if line.strip().startswith("#")] or [""]
+        target = max(1, int(self.max_output_tokens * self.fill_ratio))
+
+        tokens = []
+        bullet = 0
+        while len(tokens) < target:
+            heading = headings[bullet % len(headings)]
+            if heading and bullet < len(headings):
+                tokens.append(("\n\n" if tokens else "") + heading)
+            bullet += 1
+            tokens.extend(f"\n- Placeholder recommendation {bullet} ({digest}) for local testing.".split(" "))
+        return tokens[:target]
+
+    def _emit(self, messages: List[BaseMessage]) -> Iterator[str]:
+        """Yield reply chunks at the simulated latency."""
+        if self._should_fail():
+            time.sleep(self.first_token_delay)
+            raise ServiceUnavailable("Injected fake LLM failure")
+
+        tokens = self._reply_tokens(messages)
+        time.sleep(self.first_token_delay)
+        for start in range(0, len(tokens), CHUNK_TOKENS):
+            chunk = tokens[start:start + CHUNK_TOKENS]
+            if start and self.tokens_per_second > 0:
+                time.sleep(len(chunk) / self.tokens_per_second)
+            yield " ".join(chunk)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text = " ".join(self._emit(messages))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        first = True
+        for text in self._emit(messages):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text if first else " " + text))
+            first = False
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
@@ -2,9 +2,21 @@
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import collections
+import contextlib
+import datetime
+import hashlib
+import heapq
+import itertools
+import json
 import os
+import re
+import threading
+import time
 from dotenv import load_dotenv
 import logging
+from disk_cache import open_disk_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,20 +25,194 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-def get_llm():
+# Messages shown in place of the itinerary when generation is not possible
+PLAN_UNAVAILABLE_MESSAGE = "Unable to generate travel plan at this time. Please try again later."
+PLAN_ERROR_MESSAGE = ("Sorry, we encountered an issue while creating your travel plan. Please try again with "
+                      "different parameters or contact support if the problem persists.")
+PLAN_BUSY_MESSAGE = ("We're generating a lot of travel plans right now. Please try again in a minute "
+                     "and your itinerary will be ready shortly.")
+PLAN_FAILURE_MESSAGES = (PLAN_UNAVAILABLE_MESSAGE, PLAN_ERROR_MESSAGE, PLAN_BUSY_MESSAGE)
+
+# Errors that are worth retrying on the existing client; anything else rebuilds it
+TRANSIENT_LLM_ERRORS = ("ResourceExhausted", "TooManyRequests", "DeadlineExceeded", "ServiceUnavailable", "TimeoutError")
+
+# Persistent cache of generated plans keyed by a travel-request fingerprint (empty path disables it)
+PLAN_CACHE_PATH = os.getenv("PLAN_CACHE_PATH", os.path.join(".cache", "plan_cache.sqlite3"))
+PLAN_CACHE_TTL = int(os.getenv("PLAN_CACHE_TTL", str(7 * 24 * 3600)))
+PLAN_CACHE_MAX_BYTES = int(os.getenv("PLAN_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+PLAN_CACHE_BUDGET_BUCKET = int(os.getenv("PLAN_CACHE_BUDGET_BUCKET", "250"))
+
+# Section-parallel generation: one prompt per itinerary section, generated concurrently.
+# Daily itineraries longer than PLAN_SECTION_DAYS are further split into day ranges.
+# A section that isn't ready PLAN_SECTION_TIMEOUT seconds after its scheduler
+# queue deadline is reported as busy instead of holding up the rest of the plan.
+PLAN_SECTION_MODE = os.getenv("PLAN_SECTION_MODE", "false").lower() in ("1", "true", "yes")
+PLAN_SECTION_DAYS = int(os.getenv("PLAN_SECTION_DAYS", "4"))
+PLAN_SECTION_WORKERS = int(os.getenv("PLAN_SECTION_WORKERS", "8"))
+PLAN_SECTION_TIMEOUT = float(os.getenv("PLAN_SECTION_TIMEOUT", "60"))
+
+# Process-wide LLM scheduler: at most LLM_MAX_CONCURRENCY calls in flight, at most
+# LLM_MAX_QUEUE callers waiting, and no caller waiting longer than LLM_QUEUE_TIMEOUT seconds
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "16"))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "20"))
+
+# Chat model backend: "gemini" for production, "fake" for the deterministic local
+# stand-in in fake_llm.py (load tests and benchmarks without spending quota)
+TRAVEL_LLM_PROVIDER = os.getenv("TRAVEL_LLM_PROVIDER", "gemini").lower()
+
+# Scheduling priorities (lower is served first): user-facing generation before warmers
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# Output-token budgeting: PLAN_TOKENS_PER_SECTION for each fixed section plus
+# PLAN_TOKENS_PER_DAY for each itinerary day, rounded up to PLAN_TOKENS_STEP and
+# clamped to [PLAN_MIN_TOKENS, PLAN_MAX_TOKENS]. PLAN_DEFAULT_TOKENS is used when
+# the trip length can't be parsed.
+PLAN_TOKENS_PER_SECTION = int(os.getenv("PLAN_TOKENS_PER_SECTION", "224"))
+PLAN_TOKENS_PER_DAY = int(os.getenv("PLAN_TOKENS_PER_DAY", "256"))
+PLAN_TOKENS_STEP = int(os.getenv("PLAN_TOKENS_STEP", "256"))
+PLAN_MIN_TOKENS = int(os.getenv("PLAN_MIN_TOKENS", "512"))
+PLAN_MAX_TOKENS = int(os.getenv("PLAN_MAX_TOKENS", "8192"))
+PLAN_DEFAULT_TOKENS = int(os.getenv("PLAN_DEFAULT_TOKENS", "2048"))
+
+# Level of detail requested from the model, chosen from the trip length so long
+# trips stay within their token budget instead of being cut off mid-itinerary
+DETAIL_INSTRUCTIONS = {
+    "detailed": "Go into depth: give several specific, named recommendations with prices and insider tips.",
+    "standard": "Keep each bullet informative but brief.",
+    "concise": "Be concise: one short line per bullet and no filler, so every day of the trip is covered."
+}
+
+# Process-wide LLM clients and chains, shared by all sessions and keyed by output-token budget
+_llms = {}
+_travel_chains = {}
+_llm_lock = threading.Lock()
+
+class LLMBusyError(Exception):
+    """Raised when an LLM call is not admitted because the scheduler is saturated."""
+
+class LLMScheduler:
+    """
+    Process-wide admission control for LLM calls
+
+    At most max_concurrent calls run at once. Further callers wait in a
+    priority queue (lower value first, FIFO within a priority class); when
+    max_queue callers are already waiting, or a caller has waited longer
+    than queue_timeout, LLMBusyError is raised instead of piling more work
+    onto the quota.
+    """
+
+    def __init__(self, max_concurrent, max_queue, queue_timeout, window=500):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._cond = threading.Condition()
+        self._waiters = []  # heap of (priority, sequence)
+        self._sequence = itertools.count()
+        self._queue_times = collections.deque(maxlen=window)
+        self._counts = {"admitted": 0, "rejected": 0, "timed_out": 0}
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE):
+        """
+        Wait for a free slot, queueing behind higher-priority and earlier callers
+
+        Args:
+            priority (int): PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+        Returns:
+            float: Seconds spent in the queue
+
+        Raises:
+            LLMBusyError: If the queue is full or the wait exceeds queue_timeout
+        """
+        started = time.monotonic()
+        deadline = started + self.queue_timeout
+        ticket = (priority, next(self._sequence))
+
+        with self._cond:
+            if self._active >= self.max_concurrent and len(self._waiters) >= self.max_queue:
+                self._counts["rejected"] += 1
+                raise LLMBusyError(f"LLM queue is full ({len(self._waiters)} waiting)")
+
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while self._waiters[0] != ticket or self._active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counts["timed_out"] += 1
+                        raise LLMBusyError(f"No LLM slot within {self.queue_timeout} seconds")
+                    self._cond.wait(remaining)
+
+                self._active += 1
+                waited = time.monotonic() - started
+                self._queue_times.append(waited)
+                self._counts["admitted"] += 1
+                return waited
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def release(self):
+        """Free a slot taken by acquire."""
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self, priority=PRIORITY_INTERACTIVE):
+        """Hold a slot for the duration of a with block."""
+        waited = self.acquire(priority)
+        if waited > 1:
+            logger.info(f"LLM call waited {waited:.2f}s in the scheduler queue")
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        """Return concurrency, queue depth, admission counters and queue-time percentiles."""
+        with self._cond:
+            queue_times = sorted(self._queue_times)
+            stats = dict(self._counts, active=self._active, queued=len(self._waiters),
+                         max_concurrent=self.max_concurrent, max_queue=self.max_queue)
+
+        if queue_times:
+            stats["queue_time_p50"] = queue_times[len(queue_times) // 2]
+            stats["queue_time_p95"] = queue_times[min(len(queue_times) - 1, int(len(queue_times) * 0.95))]
+            stats["queue_time_max"] = queue_times[-1]
+        return stats
+
+_llm_scheduler = LLMScheduler(LLM_MAX_CONCURRENCY, LLM_MAX_QUEUE, LLM_QUEUE_TIMEOUT)
+
+def get_llm_scheduler_stats():
+    """Return the LLM scheduler's current load and queue-time metrics."""
+    return _llm_scheduler.stats()
+
+def llm_configured():
+    """Return True if an LLM client can be created: the fake provider, or Gemini with an API key."""
+    return TRAVEL_LLM_PROVIDER == "fake" or bool(os.getenv("GOOGLE_API_KEY"))
+
+def _create_llm(max_output_tokens=PLAN_DEFAULT_TOKENS):
     """Initialize and return the LLM with proper error handling."""
     try:
         # Check if API key is available
-        if not os.getenv("GOOGLE_API_KEY"):
+        if not llm_configured():
             logger.warning("GOOGLE_API_KEY not found in environment variables")
             # Fallback message if API key is missing
             return None
 
+        if TRAVEL_LLM_PROVIDER == "fake":
+            from fake_llm import FakeTravelChatModel
+            return FakeTravelChatModel(max_output_tokens=max_output_tokens)
+
         # Initialize the LLM
         return ChatGoogleGenerativeAI(
             model="gemini-2.5-flash",
             temperature=0.7,
-            max_output_tokens=2048,
+            max_output_tokens=max_output_tokens,
             top_p=0.95,
             top_k=40
         )
@@ -82,39 +268,651 @@ Create a day-by-day plan covering the entire duration of the trip ({dates}), inc
 
 Format the itinerary in a clear, organized manner with appropriate headings and bullet points.
 Make specific recommendations rather than generic advice.
+{detail}
 """
 
 prompt = PromptTemplate(
-    input_variables=["destination", "dates", "budget"],
+    input_variables=["destination", "dates", "budget", "detail"],
     template=template,
 )
 
-def generate_travel_plan(destination, dates, budget):
-    """Generate a travel plan using LangChain with error handling."""
+_plan_cache = open_disk_cache(PLAN_CACHE_PATH, PLAN_CACHE_MAX_BYTES)
+
+# Month names accepted in travel dates
+MONTHS = {
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7, "aug": 8,
+    "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12
+}
+
+def parse_trip_dates(dates):
+    """
+    Parse a travel date range such as "December 5-9, 2025" or "Dec 30 - Jan 3, 2026"
+
+    Args:
+        dates (str): Travel dates as entered by the user
+
+    Returns:
+        tuple: (start_date, end_date) as datetime.date objects, or None if unparseable
+    """
+    text = dates.strip().lower()
     try:
-        # Get LLM instance
-        llm = get_llm()
+        # Same month: "December 5-9, 2025"
+        match = re.search(r"([a-z]+)\.?\s+(\d{1,2})\s*[-–—]\s*(\d{1,2}),?\s+(\d{4})", text)
+        if match and match.group(1) in MONTHS:
+            month_name, start_day, end_day, year = match.groups()
+            month = MONTHS[month_name]
+            start = datetime.date(int(year), month, int(start_day))
+            end = datetime.date(int(year), month, int(end_day))
+            return (start, end) if end >= start else None
 
-        # If LLM initialization failed, return a fallback message
+        # Across months: "Dec 30 - Jan 3, 2026" (the year belongs to the end date)
+        match = re.search(r"([a-z]+)\.?\s+(\d{1,2})\s*[-–—]\s*([a-z]+)\.?\s+(\d{1,2}),?\s+(\d{4})", text)
+        if match and match.group(1) in MONTHS and match.group(3) in MONTHS:
+            start_month, start_day, end_month, end_day, year = match.groups()
+            end = datetime.date(int(year), MONTHS[end_month], int(end_day))
+            start_year = int(year) - 1 if MONTHS[start_month] > MONTHS[end_month] else int(year)
+            start = datetime.date(start_year, MONTHS[start_month], int(start_day))
+            return (start, end) if end >= start else None
+    except ValueError:
+        # Impossible dates such as "February 30"
+        return None
+
+    return None
+
+def trip_length(dates):
+    """Return the number of days in a travel date range, or None if it can't be parsed."""
+    parsed_dates = parse_trip_dates(dates)
+    return (parsed_dates[1] - parsed_dates[0]).days + 1 if parsed_dates else None
+
+def detail_level(trip_days):
+    """Pick the itinerary detail level for a trip length (None means unknown)."""
+    if trip_days is None or 3 < trip_days <= 7:
+        return "standard"
+    return "detailed" if trip_days <= 3 else "concise"
+
+def output_token_budget(trip_days, section_count):
+    """
+    Size max_output_tokens for a prompt
+
+    Args:
+        trip_days (int): Itinerary days the prompt covers (0 for none, None if unknown)
+        section_count (int): Number of fixed (non-itinerary) sections the prompt asks for
+
+    Returns:
+        int: Output-token budget, a multiple of PLAN_TOKENS_STEP within the configured bounds
+    """
+    if trip_days is None:
+        return PLAN_DEFAULT_TOKENS
+
+    tokens = section_count * PLAN_TOKENS_PER_SECTION + trip_days * PLAN_TOKENS_PER_DAY
+    # Round up to a step so only a handful of distinct clients are ever created
+    tokens = -(-tokens // PLAN_TOKENS_STEP) * PLAN_TOKENS_STEP
+    return max(PLAN_MIN_TOKENS, min(PLAN_MAX_TOKENS, tokens))
+
+def budget_bucket(budget):
+    """Round a budget down to its cache bucket so nearby budgets share cached plans."""
+    return int(float(budget) // PLAN_CACHE_BUDGET_BUCKET * PLAN_CACHE_BUDGET_BUCKET)
+
+def normalize_plan_inputs(destination, dates, budget):
+    """
+    Reduce travel plan inputs to their canonical form
+
+    The destination is case- and whitespace-normalized, dates are reduced to
+    the parsed ISO date range, and the budget to its bucket.
+
+    Returns:
+        dict: {"destination": str, "dates": str, "budget": int}
+    """
+    parsed_dates = parse_trip_dates(dates)
+    if parsed_dates:
+        date_key = f"{parsed_dates[0].isoformat()}/{parsed_dates[1].isoformat()}"
+    else:
+        date_key = " ".join(dates.lower().split())
+
+    return {
+        "destination": " ".join(destination.lower().split()),
+        "dates": date_key,
+        "budget": budget_bucket(budget)
+    }
+
+def _fingerprint(template_text, inputs):
+    """Hash a prompt template together with its normalized inputs."""
+    material = json.dumps({
+        "template": hashlib.sha256(template_text.encode("utf-8")).hexdigest(),
+        "inputs": inputs
+    }, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+def plan_fingerprint(destination, dates, budget):
+    """
+    Build a canonical fingerprint of the travel plan prompt inputs
+
+    The template itself is part of the fingerprint, so prompt changes
+    invalidate old plans.
+
+    Args:
+        destination (str): Trip destination
+        dates (str): Travel dates
+        budget (float): Total trip budget
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    return _fingerprint(template, normalize_plan_inputs(destination, dates, budget))
+
+def get_cached_plan(destination, dates, budget):
+    """Return a cached travel plan for the request, or None."""
+    if _plan_cache is None:
+        return None
+    return _plan_cache.get(plan_fingerprint(destination, dates, budget))
+
+def store_plan(destination, dates, budget, travel_plan):
+    """Store a successfully generated travel plan in the plan cache."""
+    if _plan_cache is not None and travel_plan:
+        _plan_cache.set(plan_fingerprint(destination, dates, budget), travel_plan, PLAN_CACHE_TTL)
+
+def get_llm(max_output_tokens=PLAN_DEFAULT_TOKENS):
+    """Return the shared LLM client for an output-token budget, creating it on first use."""
+    llm = _llms.get(max_output_tokens)
+    if llm is None:
+        with _llm_lock:
+            llm = _llms.get(max_output_tokens)
+            if llm is None:
+                llm = _create_llm(max_output_tokens)
+                if llm is not None:
+                    _llms[max_output_tokens] = llm
+    return llm
+
+def get_travel_chain(max_output_tokens=PLAN_DEFAULT_TOKENS):
+    """Return the shared travel plan chain for an output-token budget, or None if the LLM is unavailable."""
+    travel_chain = _travel_chains.get(max_output_tokens)
+    if travel_chain is None:
+        llm = get_llm(max_output_tokens)
         if llm is None:
-            return "Unable to generate travel plan at this time. Please try again later."
+            return None
+        with _llm_lock:
+            travel_chain = _travel_chains.get(max_output_tokens)
+            if travel_chain is None:
+                travel_chain = LLMChain(
+                    llm=llm,
+                    prompt=prompt,
+                    verbose=False,  # Set to True for debugging
+                )
+                _travel_chains[max_output_tokens] = travel_chain
+    return travel_chain
 
-        # Create the chain
-        travel_chain = LLMChain(
-            llm=llm,
-            prompt=prompt,
-            verbose=False,  # Set to True for debugging
-        )
+def reset_llm():
+    """Drop the shared LLM clients and chains so the next call rebuilds them."""
+    with _llm_lock:
+        _llms.clear()
+        _travel_chains.clear()
 
-        # Run the chain
-        result = travel_chain.run(
-            destination=destination,
-            dates=dates,
-            budget=budget
-        )
+def plan_generation_settings(dates):
+    """
+    Choose the output-token budget and detail level for a single-prompt plan
+
+    Returns:
+        tuple: (max_output_tokens, detail level name)
+    """
+    trip_days = trip_length(dates)
+    fixed_sections = sum(1 for section in PLAN_SECTIONS if section["key"] != "daily_itinerary")
+    return output_token_budget(trip_days, fixed_sections), detail_level(trip_days)
+
+def _handle_llm_error(e):
+    """Log a generation error, rebuild the client if needed, and return the user-facing message."""
+    if isinstance(e, LLMBusyError):
+        logger.warning(f"Travel plan request shed by the LLM scheduler: {str(e)}")
+        return PLAN_BUSY_MESSAGE
+
+    logger.error(f"Error generating travel plan: {str(e)}")
+    if type(e).__name__ not in TRANSIENT_LLM_ERRORS:
+        # The client may be in a bad state (auth, channel); rebuild it on the next call
+        reset_llm()
+    return PLAN_ERROR_MESSAGE
+
+def generate_travel_plan(destination, dates, budget, state=None, priority=PRIORITY_INTERACTIVE):
+    """
+    Generate a travel plan using LangChain with error handling
+
+    In section-parallel mode, passing the state dict from the previous plan
+    regenerates only the sections affected by the changed inputs. Model
+    calls go through the process-wide LLM scheduler at the given priority.
+    """
+    if PLAN_SECTION_MODE:
+        return generate_plan_sections(destination, dates, budget, state, priority)
+
+    # Identical requests are answered from the plan cache
+    cached_plan = get_cached_plan(destination, dates, budget)
+    if cached_plan is not None:
+        return cached_plan
+
+    try:
+        # Reuse the shared chain (and its LLM client) sized for this trip
+        max_output_tokens, detail = plan_generation_settings(dates)
+        travel_chain = get_travel_chain(max_output_tokens)
+
+        # If LLM initialization failed, return a fallback message
+        if travel_chain is None:
+            return PLAN_UNAVAILABLE_MESSAGE
 
+        # Run the chain once the scheduler admits the call
+        with _llm_scheduler.slot(priority):
+            started = time.monotonic()
+            result = travel_chain.run(
+                destination=destination,
+                dates=dates,
+                budget=budget,
+                detail=DETAIL_INSTRUCTIONS[detail]
+            )
+        logger.info(f"Generated travel plan with max_output_tokens={max_output_tokens} ({detail}) "
+                    f"in {time.monotonic() - started:.2f}s")
+
+        store_plan(destination, dates, budget, result)
         return result
 
     except Exception as e:
-        logger.error(f"Error generating travel plan: {str(e)}")
-        return f"Sorry, we encountered an issue while creating your travel plan. Please try again with different parameters or contact support if the problem persists."
+        return _handle_llm_error(e)
+
+def stream_travel_plan(destination, dates, budget, state=None, priority=PRIORITY_INTERACTIVE):
+    """
+    Generate a travel plan, yielding text chunks as the model produces them
+
+    Args:
+        destination (str): Trip destination
+        dates (str): Travel dates, e.g. "December 5-9, 2025"
+        budget (float): Total trip budget
+        state (dict, optional): Previous plan state for incremental regeneration in section mode
+        priority (int): Scheduler priority, PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+    Yields:
+        str: Consecutive pieces of the travel plan (or a fallback message)
+    """
+    if PLAN_SECTION_MODE:
+        yield from stream_plan_sections(destination, dates, budget, state, priority)
+        return
+
+    # Identical requests are answered from the plan cache in one piece
+    cached_plan = get_cached_plan(destination, dates, budget)
+    if cached_plan is not None:
+        yield cached_plan
+        return
+
+    max_output_tokens, detail = plan_generation_settings(dates)
+    llm = get_llm(max_output_tokens)
+    if llm is None:
+        yield PLAN_UNAVAILABLE_MESSAGE
+        return
+
+    chunks = []
+    try:
+        # The slot is held until the stream finishes or the consumer stops reading
+        with _llm_scheduler.slot(priority):
+            started = time.monotonic()
+            for chunk in llm.stream(prompt.format(destination=destination, dates=dates, budget=budget,
+                                                  detail=DETAIL_INSTRUCTIONS[detail])):
+                if isinstance(chunk.content, str) and chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+        logger.info(f"Streamed travel plan with max_output_tokens={max_output_tokens} ({detail}) "
+                    f"in {time.monotonic() - started:.2f}s")
+    except Exception as e:
+        yield ("\n\n" if chunks else "") + _handle_llm_error(e)
+        return
+
+    # Only complete plans are cached
+    store_plan(destination, dates, budget, "".join(chunks))
+
+# Prompt shared by every section in section-parallel mode
+section_template = """
+You are an expert travel consultant with extensive knowledge of global destinations.
+You are writing one part of a personalized travel plan for a trip to {trip}.
+
+Write only the content described below, without a heading, introduction or closing remarks.
+Use bullet points and make specific recommendations rather than generic advice.
+{detail}
+
+{instructions}
+"""
+
+section_prompt = PromptTemplate(
+    input_variables=["trip", "instructions", "detail"],
+    template=section_template,
+)
+
+# Itinerary sections in the order they are merged. Headings match the single-prompt
+# template so create_pdf's heading parser handles both modes. "depends_on" lists the
+# plan inputs a section is written from: its prompt only mentions those inputs, and
+# it is regenerated only when one of them changes (budget affects accommodation and
+# the budget breakdown, dates affect the daily itinerary and seasonal weather notes).
+PLAN_SECTIONS = [
+    {
+        "key": "overview",
+        "depends_on": ("destination", "dates"),
+        "parent": "# DESTINATION OVERVIEW",
+        "heading": None,
+        "instructions": """- Brief introduction to {destination}
+- Current weather and seasonal considerations for {dates}
+- Local customs, etiquette, and language tips
+- Currency and payment information"""
+    },
+    {
+        "key": "daily_itinerary",
+        "depends_on": ("destination", "dates"),
+        "parent": "# DAILY ITINERARY",
+        "heading": None,
+        "instructions": """Create a day-by-day plan covering {day_range}, including:
+- Morning activities
+- Afternoon explorations
+- Evening entertainment
+- Recommended dining options for each day
+Start each day with a bold "Day N" line."""
+    },
+    {
+        "key": "transportation",
+        "depends_on": ("destination",),
+        "parent": "# PRACTICAL INFORMATION",
+        "heading": "## Transportation",
+        "instructions": """- Best ways to get around {destination}
+- Public transit options and approximate costs
+- Recommended transportation apps"""
+    },
+    {
+        "key": "accommodation",
+        "depends_on": ("destination", "budget"),
+        "parent": "# PRACTICAL INFORMATION",
+        "heading": "## Accommodation",
+        "instructions": """- Neighborhoods that best match the traveler's budget of ${budget}
+- Estimated nightly rates
+- Special amenities to look for"""
+    },
+    {
+        "key": "budget_breakdown",
+        "depends_on": ("destination", "budget"),
+        "parent": "# PRACTICAL INFORMATION",
+        "heading": "## Budget Breakdown",
+        "instructions": """- Approximate daily costs for food, activities, and transportation
+- Suggested allocation of the ${budget} budget
+- Money-saving tips specific to {destination}"""
+    },
+    {
+        "key": "attractions",
+        "depends_on": ("destination",),
+        "parent": "# PRACTICAL INFORMATION",
+        "heading": "## Must-See Attractions",
+        "instructions": """- Top 5 attractions with estimated visit duration and costs
+- Lesser-known local gems
+- Recommended booking methods to avoid lines"""
+    },
+    {
+        "key": "culinary",
+        "depends_on": ("destination",),
+        "parent": "# PRACTICAL INFORMATION",
+        "heading": "## Culinary Experiences",
+        "instructions": """- Local specialties and where to find them
+- Price ranges for different dining options
+- Food markets and culinary tours worth exploring"""
+    }
+]
+
+# Runs section calls that already hold a scheduler slot, so it never needs more
+# workers than the scheduler admits and jobs never wait here unaccounted for
+_section_executor = ThreadPoolExecutor(max_workers=max(PLAN_SECTION_WORKERS, LLM_MAX_CONCURRENCY),
+                                       thread_name_prefix="plan-section")
+
+def _section_jobs(destination, dates, budget):
+    """
+    List the prompts needed for a section-parallel plan
+
+    Returns:
+        list: (section, job_key, instructions, days) tuples in merge order, where days is
+        the number of itinerary days the job covers (0 for fixed sections, None if unknown)
+    """
+    jobs = []
+    parsed_dates = parse_trip_dates(dates)
+    for section in PLAN_SECTIONS:
+        if section["key"] != "daily_itinerary":
+            instructions = section["instructions"].format(destination=destination, dates=dates, budget=budget)
+            jobs.append((section, section["key"], instructions, 0))
+            continue
+
+        trip_days = (parsed_dates[1] - parsed_dates[0]).days + 1 if parsed_dates else None
+        if trip_days is None or trip_days <= PLAN_SECTION_DAYS:
+            day_range = f"the entire duration of the trip ({dates})"
+            jobs.append((section, section["key"], section["instructions"].format(day_range=day_range), trip_days))
+            continue
+
+        # Long trips: one prompt per block of days
+        for first_day in range(1, trip_days + 1, PLAN_SECTION_DAYS):
+            last_day = min(first_day + PLAN_SECTION_DAYS - 1, trip_days)
+            first_date = parsed_dates[0] + datetime.timedelta(days=first_day - 1)
+            last_date = parsed_dates[0] + datetime.timedelta(days=last_day - 1)
+            day_range = (f"only days {first_day} to {last_day} of the {trip_days}-day trip "
+                         f"({first_date.strftime('%B %d')} to {last_date.strftime('%B %d, %Y')})")
+            jobs.append((section, f"{section['key']}:{first_day}-{last_day}",
+                         section["instructions"].format(day_range=day_range), last_day - first_day + 1))
+    return jobs
+
+def _strip_heading(text, section):
+    """Drop a heading line the model added on its own, since the merge adds headings."""
+    lines = text.strip().splitlines()
+    titles = [title.lstrip("# ").lower() for title in (section["parent"], section["heading"]) if title]
+    if lines and lines[0].startswith("#") and any(title in lines[0].lower() for title in titles):
+        lines = lines[1:]
+    return "\n".join(lines).strip()
+
+def _describe_trip(section, destination, dates, budget):
+    """Describe the trip using only the inputs the section depends on."""
+    trip = destination
+    if "dates" in section["depends_on"]:
+        trip += f" during {dates}"
+    if "budget" in section["depends_on"]:
+        trip += f" with a budget of ${budget}"
+    return trip
+
+def _section_inputs_changed(section, previous_inputs, inputs):
+    """Return True if any input the section depends on differs between two normalized input sets."""
+    return any(previous_inputs.get(name) != inputs[name] for name in section["depends_on"])
+
+def _section_cache_key(job, destination, dates, budget):
+    """
+    Return the detail level and plan cache key of a section job
+
+    Returns:
+        tuple: (detail level name, cache key)
+    """
+    section, job_key = job[:2]
+    # Only date-dependent sections scale their detail with the trip length
+    detail = detail_level(trip_length(dates)) if "dates" in section["depends_on"] else "standard"
+    inputs = normalize_plan_inputs(destination, dates, budget)
+    cache_key = _fingerprint(section_template + job_key + section["instructions"] + DETAIL_INSTRUCTIONS[detail],
+                             {name: inputs[name] for name in section["depends_on"]})
+    return detail, cache_key
+
+def get_cached_section(job, destination, dates, budget):
+    """Return the cached text of a section job, or None."""
+    if _plan_cache is None:
+        return None
+    return _plan_cache.get(_section_cache_key(job, destination, dates, budget)[1])
+
+def _generate_section(job, destination, dates, budget):
+    """Generate the text for one section job; the caller holds a scheduler slot for it."""
+    section, job_key, instructions, days = job
+    detail, cache_key = _section_cache_key(job, destination, dates, budget)
+
+    max_output_tokens = output_token_budget(days, 0 if days else 1)
+    llm = get_llm(max_output_tokens)
+    if llm is None:
+        raise RuntimeError("LLM client is unavailable")
+
+    started = time.monotonic()
+    response = llm.invoke(section_prompt.format(
+        trip=_describe_trip(section, destination, dates, budget), instructions=instructions,
+        detail=DETAIL_INSTRUCTIONS[detail]
+    ))
+    logger.info(f"Generated plan section {job_key} with max_output_tokens={max_output_tokens} ({detail}) "
+                f"in {time.monotonic() - started:.2f}s")
+    text = _strip_heading(response.content, section)
+    if _plan_cache is not None and text:
+        _plan_cache.set(cache_key, text, PLAN_CACHE_TTL)
+    return text
+
+def _run_admitted_section(future, job, destination, dates, budget):
+    """Generate a section that holds a scheduler slot, resolve its future and free the slot."""
+    try:
+        future.set_result(_generate_section(job, destination, dates, budget))
+    except Exception as e:
+        future.set_exception(e)
+    finally:
+        _llm_scheduler.release()
+
+def _start_admitted_section(future, job, destination, dates, budget):
+    """Hand an admitted section to the section workers, or free its slot if the plan was abandoned."""
+    if not future.set_running_or_notify_cancel():
+        _llm_scheduler.release()
+        return
+    _section_executor.submit(_run_admitted_section, future, job, destination, dates, budget)
+
+def _dispatch_sections(pending, destination, dates, budget, priority):
+    """
+    Admit the remaining sections of an admitted plan through the scheduler, in plan order
+
+    Each section waits for its own slot, so a plan never has more than one
+    section queued in the scheduler. If a section is not admitted, it and
+    every section after it fail with the scheduler's LLMBusyError.
+
+    Args:
+        pending (list): (job, future) pairs still waiting for a slot
+    """
+    for index, (job, future) in enumerate(pending):
+        if future.cancelled():
+            continue
+        try:
+            _llm_scheduler.acquire(priority)
+        except LLMBusyError as e:
+            for _, remaining in pending[index:]:
+                if remaining.set_running_or_notify_cancel():
+                    remaining.set_exception(e)
+            return
+        _start_admitted_section(future, job, destination, dates, budget)
+
+def is_plan_cached(destination, dates, budget):
+    """
+    Return True if a plan for the request can be served from the plan cache
+
+    Matches the generation mode: in section mode every section of the trip
+    must be cached, otherwise the whole single-prompt plan.
+    """
+    if not PLAN_SECTION_MODE:
+        return get_cached_plan(destination, dates, budget) is not None
+    return all(get_cached_section(job, destination, dates, budget) is not None
+               for job in _section_jobs(destination, dates, budget))
+
+def stream_plan_sections(destination, dates, budget, state=None, priority=PRIORITY_INTERACTIVE):
+    """
+    Generate a travel plan one section per prompt, all sections concurrently
+
+    Sections are yielded in the fixed template order as soon as they and
+    every section before them are ready, with the same headings as the
+    single-prompt template.
+
+    The plan is admitted through the LLM scheduler as a whole: its first
+    uncached section waits for a slot in the caller, so a saturated
+    scheduler sheds the plan with PLAN_BUSY_MESSAGE just like a
+    single-prompt plan. The remaining sections then take slots one at a
+    time as they free up.
+
+    When a state dict from a previous plan is passed, sections whose inputs
+    did not change are reused from it and only the affected sections are
+    regenerated; the dict is then updated in place for the next call.
+
+    Args:
+        destination (str): Trip destination
+        dates (str): Travel dates
+        budget (float): Total trip budget
+        state (dict, optional): Previous plan state, e.g. kept in st.session_state
+        priority (int): Scheduler priority for the section calls
+
+    Yields:
+        str: Consecutive pieces of the merged travel plan
+    """
+    # Checked without building a client, since sections use clients sized per job
+    if not llm_configured():
+        yield PLAN_UNAVAILABLE_MESSAGE
+        return
+
+    inputs = normalize_plan_inputs(destination, dates, budget)
+    previous_inputs = state.get("inputs", {}) if state is not None else {}
+    previous_sections = state.get("sections", {}) if state is not None else {}
+
+    jobs = _section_jobs(destination, dates, budget)
+    futures = []
+    pending = []
+    for job in jobs:
+        section, job_key = job[:2]
+        if job_key in previous_sections and not _section_inputs_changed(section, previous_inputs, inputs):
+            futures.append(None)  # Unaffected by the input change
+            continue
+
+        future = Future()
+        cached_text = get_cached_section(job, destination, dates, budget)
+        if cached_text is not None:
+            future.set_result(cached_text)
+        else:
+            pending.append((job, future))
+        futures.append(future)
+
+    if pending:
+        try:
+            _llm_scheduler.acquire(priority)
+        except LLMBusyError as e:
+            yield _handle_llm_error(e)
+            return
+        _start_admitted_section(pending[0][1], pending[0][0], destination, dates, budget)
+        if len(pending) > 1:
+            threading.Thread(target=_dispatch_sections, args=(pending[1:], destination, dates, budget, priority),
+                             name="plan-dispatch", daemon=True).start()
+
+    sections = {}
+
+    current_parent = None
+    current_key = None
+    try:
+        for job, future in zip(jobs, futures):
+            section = job[0]
+            headings = []
+            if section["parent"] != current_parent:
+                headings.append(section["parent"])
+                current_parent = section["parent"]
+            if section["heading"] and section["key"] != current_key:
+                headings.append(section["heading"])
+            current_key = section["key"]
+
+            if future is None:
+                text = previous_sections[job[1]]
+                sections[job[1]] = text
+            else:
+                try:
+                    text = future.result(timeout=LLM_QUEUE_TIMEOUT + PLAN_SECTION_TIMEOUT)
+                    sections[job[1]] = text
+                except FutureTimeoutError:
+                    text = _handle_llm_error(LLMBusyError(f"Plan section {job[1]} was not ready in time"))
+                except Exception as e:
+                    text = _handle_llm_error(e)
+
+            prefix = "" if job is jobs[0] else "\n\n"
+            yield prefix + "\n\n".join(headings + [text])
+    finally:
+        # Sections not admitted yet are dropped if the consumer stops reading
+        for future in futures:
+            if future is not None:
+                future.cancel()
+
+    if state is not None:
+        state["inputs"] = inputs
+        state["sections"] = sections
+
+def generate_plan_sections(destination, dates, budget, state=None, priority=PRIORITY_INTERACTIVE):
+    """Generate a complete travel plan in section-parallel mode (see stream_plan_sections)."""
+    return "".join(stream_plan_sections(destination, dates, budget, state, priority))
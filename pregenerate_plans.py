@@ -0,0 +1,178 @@
+# pregenerate_plans.py
+"""
+Pre-generate travel plans for popular destinations, date buckets and budget buckets
+
+Plans are generated through generate_travel_plan, so they land in the same plan
+cache the app reads and peak-hour users get them instantly. Meant to run as a
+cron-style job:
+
+    python pregenerate_plans.py popular_trips.json --rate 6
+
+The input file is a JSON list of [destination, dates, budget] entries (or
+objects with those keys), e.g. [["Paris", "December 5-9, 2025", 2000]].
+Completed entries are recorded in a checkpoint file so an interrupted run
+resumes where it stopped. The checkpoint is removed once a run finishes, so
+later runs go by the plan cache alone (whole plans, or every section in
+section mode) and regenerate plans that expired.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from langchain_integration import (
+    PLAN_FAILURE_MESSAGES,
+    PRIORITY_BACKGROUND,
+    budget_bucket,
+    generate_travel_plan,
+    is_plan_cached,
+    plan_fingerprint,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default pacing and checkpoint location
+PREGENERATE_RATE = float(os.getenv("PREGENERATE_RATE", "6"))  # plans per minute
+PREGENERATE_CHECKPOINT = os.getenv("PREGENERATE_CHECKPOINT", os.path.join(".cache", "pregenerate_checkpoint.json"))
+
+def load_trips(path):
+    """
+    Load the (destination, dates, budget bucket) tuples to pre-generate
+
+    Args:
+        path (str): JSON file with a list of [destination, dates, budget] entries
+            or {"destination", "dates", "budget"} objects
+
+    Returns:
+        list: (destination, dates, budget) tuples, duplicates removed
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    trips = []
+    seen = set()
+    for entry in entries:
+        if isinstance(entry, dict):
+            destination, dates, budget = entry["destination"], entry["dates"], entry["budget"]
+        else:
+            destination, dates, budget = entry
+
+        # Generate for the bucket itself so the prompt matches what the bucket stands for
+        trip = (destination, dates, budget_bucket(budget))
+        fingerprint = plan_fingerprint(*trip)
+        if fingerprint not in seen:
+            seen.add(fingerprint)
+            trips.append(trip)
+    return trips
+
+def load_checkpoint(path):
+    """Return the set of plan fingerprints completed by earlier runs."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return set(json.load(f).get("completed", []))
+    except FileNotFoundError:
+        return set()
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable checkpoint {path}: {str(e)}")
+        return set()
+
+def save_checkpoint(path, completed):
+    """Atomically write the completed plan fingerprints."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"completed": sorted(completed), "updated_at": time.time()}, f)
+    os.replace(temp_path, path)
+
+def is_failed_plan(travel_plan):
+    """Return True if generation returned a fallback message instead of a plan."""
+    return not travel_plan or any(message in travel_plan for message in PLAN_FAILURE_MESSAGES)
+
+def pregenerate(trips, rate=PREGENERATE_RATE, checkpoint_path=PREGENERATE_CHECKPOINT):
+    """
+    Generate and cache a plan for every trip that isn't cached yet
+
+    Args:
+        trips (list): (destination, dates, budget) tuples
+        rate (float): Maximum number of plans generated per minute (0 disables pacing)
+        checkpoint_path (str): File recording the trips completed by an interrupted run
+
+    Returns:
+        dict: Counts of generated, skipped and failed trips
+    """
+    completed = load_checkpoint(checkpoint_path)
+    counts = {"generated": 0, "skipped": 0, "failed": 0}
+    interval = 60.0 / rate if rate > 0 else 0
+    next_start = time.monotonic()
+    started = time.monotonic()
+
+    for index, (destination, dates, budget) in enumerate(trips, start=1):
+        label = f"[{index}/{len(trips)}] {destination}, {dates}, ${budget}"
+        fingerprint = plan_fingerprint(destination, dates, budget)
+
+        if fingerprint in completed or is_plan_cached(destination, dates, budget):
+            completed.add(fingerprint)
+            counts["skipped"] += 1
+            logger.info(f"{label}: already cached")
+            continue
+
+        # Pace generation so the job never competes with users for the whole quota
+        delay = next_start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        next_start = time.monotonic() + interval
+
+        call_started = time.monotonic()
+        travel_plan = generate_travel_plan(destination, dates, budget, priority=PRIORITY_BACKGROUND)
+        elapsed = time.monotonic() - call_started
+
+        if is_failed_plan(travel_plan):
+            counts["failed"] += 1
+            logger.warning(f"{label}: generation failed after {elapsed:.1f}s, will retry on the next run")
+            continue
+
+        completed.add(fingerprint)
+        save_checkpoint(checkpoint_path, completed)
+        counts["generated"] += 1
+
+        # Estimate the remaining time from the average so far (paced or not)
+        remaining = len(trips) - index
+        average = (time.monotonic() - started) / index
+        logger.info(f"{label}: generated in {elapsed:.1f}s, about {remaining * average / 60:.1f} min remaining")
+
+    # The run finished, so there is nothing left to resume
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return counts
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Pre-generate and cache travel plans for popular trips.")
+    parser.add_argument("trips_file", help="JSON list of [destination, dates, budget] entries")
+    parser.add_argument("--rate", type=float, default=PREGENERATE_RATE,
+                        help="maximum plans generated per minute (0 disables pacing)")
+    parser.add_argument("--checkpoint", default=PREGENERATE_CHECKPOINT,
+                        help="checkpoint file used to resume interrupted runs")
+    parser.add_argument("--restart", action="store_true", help="ignore and replace an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    trips = load_trips(args.trips_file)
+    logger.info(f"Pre-generating plans for {len(trips)} trips")
+    counts = pregenerate(trips, rate=args.rate, checkpoint_path=args.checkpoint)
+    logger.info(f"Done: {counts['generated']} generated, {counts['skipped']} skipped, {counts['failed']} failed")
+
+    # A non-zero exit lets the scheduler flag runs that left trips uncached
+    return 1 if counts["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,20 @@
 # search_api.py
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict, namedtuple
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import itertools
+import json
 import os
+import random
+import threading
+import time
 from dotenv import load_dotenv
 import logging
+from disk_cache import open_disk_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,16 +23,628 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-def search_destination_info(destination, query_type="search"):
+# Serper.dev API endpoint
+SERPER_BASE_URL = "https://google.serper.dev"
+
+# HTTP client settings (connect and read timeouts in seconds)
+SERPER_CONNECT_TIMEOUT = float(os.getenv("SERPER_CONNECT_TIMEOUT", "3.05"))
+SERPER_READ_TIMEOUT = float(os.getenv("SERPER_READ_TIMEOUT", "10"))
+SERPER_POOL_SIZE = int(os.getenv("SERPER_POOL_SIZE", "10"))
+SERPER_MAX_RETRIES = int(os.getenv("SERPER_MAX_RETRIES", "3"))
+SERPER_BACKOFF_FACTOR = float(os.getenv("SERPER_BACKOFF_FACTOR", "0.3"))
+
+# Client-side rate limit for the Serper API key: sustained requests per second,
+# burst size, and how long a request may queue for a token before failing
+SERPER_RATE_LIMIT = float(os.getenv("SERPER_RATE_LIMIT", "5"))
+SERPER_RATE_BURST = int(os.getenv("SERPER_RATE_BURST", "10"))
+SERPER_RATE_LIMIT_WAIT = float(os.getenv("SERPER_RATE_LIMIT_WAIT", "5"))
+
+# Quota accounting: credits charged per query type and the plan's total credits (0 = unknown)
+SERPER_CREDITS_PER_QUERY = {"search": 1, "images": 1, "places": 1, "news": 1}
+SERPER_CREDIT_QUOTA = int(os.getenv("SERPER_CREDIT_QUOTA", "0"))
+
+# Circuit breaker: trip after this many consecutive failures or slow calls
+# (slower than the latency SLO in seconds), then probe again after the reset timeout
+SERPER_BREAKER_FAILURES = int(os.getenv("SERPER_BREAKER_FAILURES", "5"))
+SERPER_BREAKER_LATENCY_SLO = float(os.getenv("SERPER_BREAKER_LATENCY_SLO", "5"))
+SERPER_BREAKER_RESET_TIMEOUT = float(os.getenv("SERPER_BREAKER_RESET_TIMEOUT", "30"))
+
+# Priority classes for upstream calls: page renders go before background work
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# Batch (async) client settings
+SERPER_ASYNC_CONCURRENCY = int(os.getenv("SERPER_ASYNC_CONCURRENCY", str(SERPER_POOL_SIZE)))
+SERPER_ASYNC_DEADLINE = float(os.getenv("SERPER_ASYNC_DEADLINE", "15"))
+
+class _JitteredRetry(Retry):
+    """Retry policy that adds random jitter to the exponential backoff."""
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        # Spread retries between half and the full backoff to avoid retry storms
+        return random.uniform(backoff / 2, backoff)
+
+_session = None
+_session_lock = threading.Lock()
+
+# Worker pool for fanning out independent lookups (bounded by the HTTP pool size)
+_search_executor = ThreadPoolExecutor(max_workers=SERPER_POOL_SIZE, thread_name_prefix="serper")
+
+# Separate pool for async and batch lookups, so a large search_many can't starve page renders
+_async_executor = ThreadPoolExecutor(max_workers=SERPER_ASYNC_CONCURRENCY, thread_name_prefix="serper-async")
+
+def get_http_session():
+    """
+    Return the process-wide HTTP session used for Serper.dev requests
+
+    The session keeps connections alive in a bounded pool, so repeated
+    lookups reuse the TCP/TLS connection instead of paying a new handshake.
+
+    Returns:
+        requests.Session: Shared session with pooling and retries configured
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = _JitteredRetry(
+                    total=SERPER_MAX_RETRIES,
+                    backoff_factor=SERPER_BACKOFF_FACTOR,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(["GET", "POST"]),  # Serper lookups are read-only
+                    respect_retry_after_header=True,
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=SERPER_POOL_SIZE,
+                    pool_block=True,  # Wait for a free connection instead of opening extra ones
+                    max_retries=retry
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+# Response cache settings: (soft TTL, hard TTL) per query type in seconds.
+# Past the soft TTL an entry is still served while it is refreshed in the
+# background (stale-while-revalidate); past the hard TTL it is refetched
+# before returning. News goes stale quickly, places and images rarely change.
+def _cache_ttls(query_type, soft_ttl, hard_ttl):
+    name = query_type.upper()
+    soft = int(os.getenv(f"SERPER_CACHE_SOFT_TTL_{name}", str(soft_ttl)))
+    hard = int(os.getenv(f"SERPER_CACHE_HARD_TTL_{name}", str(hard_ttl)))
+    return soft, max(soft, hard)
+
+SERPER_CACHE_TTLS = {
+    "search": _cache_ttls("search", 21600, 21600),
+    "images": _cache_ttls("images", 86400, 86400),
+    "places": _cache_ttls("places", 21600, 604800),
+    "news": _cache_ttls("news", 900, 21600)
+}
+SERPER_CACHE_MAX_BYTES = int(os.getenv("SERPER_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+class _ResultRecord:
+    """Dict-style read access for the compact Serper result records."""
+    __slots__ = ()
+
+    def get(self, field, default=None):
+        value = getattr(self, field, None)
+        return default if value is None else value
+
+class ImageResult(_ResultRecord, namedtuple("ImageResult", ["imageUrl", "title", "source", "date"])):
+    __slots__ = ()
+
+class PlaceResult(_ResultRecord, namedtuple("PlaceResult", ["title", "rating", "reviewsCount", "address", "description"])):
+    __slots__ = ()
+
+class NewsResult(_ResultRecord, namedtuple("NewsResult", ["title", "link", "date", "source"])):
+    __slots__ = ()
+
+class OrganicResult(_ResultRecord, namedtuple("OrganicResult", ["title", "link", "snippet"])):
+    __slots__ = ()
+
+# Result list kept for each query type, its record type, and how many items to keep
+SERPER_RESULT_FIELDS = {
+    "images": ("images", ImageResult, 20),
+    "places": ("places", PlaceResult, 10),
+    "news": ("news", NewsResult, 10),
+    "search": ("organic", OrganicResult, 10)
+}
+
+# Bump when the cached record layout changes so old disk entries are ignored
+SERPER_CACHE_FORMAT = 2
+
+def project_results(query_type, results):
+    """
+    Keep only the fields the app uses from a Serper response
+
+    Args:
+        query_type (str): Type of search - "search", "images", "places", or "news"
+        results (dict): Raw Serper JSON response
+
+    Returns:
+        dict: {list name: tuple of compact records}
+    """
+    list_name, record_type, max_items = SERPER_RESULT_FIELDS.get(query_type, SERPER_RESULT_FIELDS["search"])
+    items = results.get(list_name) or []
+    return {
+        list_name: tuple(
+            record_type(*(item.get(field) for field in record_type._fields))
+            for item in items[:max_items] if isinstance(item, dict)
+        )
+    }
+
+def _restore_results(query_type, stored):
+    """Rebuild compact records from their JSON form (lists of field values)."""
+    list_name, record_type, _ = SERPER_RESULT_FIELDS.get(query_type, SERPER_RESULT_FIELDS["search"])
+    return {list_name: tuple(record_type(*row) for row in stored.get(list_name, []))}
+
+def make_cache_key(query_type, query, gl="us", hl="en"):
+    """
+    Build the cache key for a Serper lookup
+
+    Queries are lowercased and whitespace-collapsed so that "Paris " and
+    "paris" share one cache entry.
+
+    Args:
+        query_type (str): Type of search - "search", "images", "places", or "news"
+        query (str): The query string sent to Serper
+        gl (str): Geolocation code
+        hl (str): Language code
+
+    Returns:
+        tuple: Hashable cache key
+    """
+    normalized_query = " ".join(str(query).lower().split())
+    return (query_type, normalized_query, gl, hl)
+
+class ResponseCache:
+    """Thread-safe LRU cache of Serper responses with soft/hard TTLs, bounded by payload bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size, stale_at, expires_at)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_entry(self, key):
+        """
+        Look up a cached value and report whether it is past its soft TTL
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            tuple: (value, is_stale), or None if the key is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size, stale_at, expires_at = entry
+            now = time.time()
+            if expires_at <= now:
+                # Expire on read
+                del self._entries[key]
+                self._bytes -= size
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            is_stale = stale_at <= now
+            if is_stale:
+                self.stale_hits += 1
+            return value, is_stale
+
+    def get(self, key):
+        """Return the cached value for key, or None if it is missing or expired."""
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key, value, ttl, soft_ttl=None):
+        """
+        Store value under key, evicting least recently used entries
+
+        Args:
+            key: Cache key from make_cache_key
+            value (dict): Response to cache
+            ttl (float): Seconds until the entry expires (hard TTL)
+            soft_ttl (float, optional): Seconds until the entry is considered stale; defaults to ttl
+        """
+        size = len(json.dumps(value, separators=(",", ":")))
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        now = time.time()
+        soft_ttl = ttl if soft_ttl is None else min(soft_ttl, ttl)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+
+            self._entries[key] = (value, size, now + soft_ttl, now + ttl)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size, _, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+# Process-wide cache shared by all Streamlit sessions
+_response_cache = ResponseCache(SERPER_CACHE_MAX_BYTES)
+
+# Persistent cache tier so restarted pods don't start cold (empty path disables it)
+SERPER_DISK_CACHE_PATH = os.getenv("SERPER_DISK_CACHE_PATH", os.path.join(".cache", "serper_cache.sqlite3"))
+SERPER_DISK_CACHE_MAX_BYTES = int(os.getenv("SERPER_DISK_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+_disk_cache = open_disk_cache(SERPER_DISK_CACHE_PATH, SERPER_DISK_CACHE_MAX_BYTES)
+
+def _disk_cache_key(cache_key):
+    """Serialize an in-memory cache key for the disk tier."""
+    return json.dumps([SERPER_CACHE_FORMAT] + list(cache_key), ensure_ascii=False)
+
+class _FlightCall:
+    """A call that concurrent callers with the same key wait on."""
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into a single in-flight call."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn once per key at a time and share its result or error with every caller
+
+        Args:
+            key: Hashable key identifying the call
+            fn (callable): Function to run if no identical call is in flight
+
+        Returns:
+            The return value of fn
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _FlightCall()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+# Identical Serper queries in flight at the same time share one request
+_in_flight = SingleFlight()
+
+# Background refreshes of stale entries
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="serper-refresh")
+_pending_refreshes = set()
+_pending_refreshes_lock = threading.Lock()
+
+class RateLimitExceeded(Exception):
+    """Raised when a request could not get a rate-limit token in time."""
+
+class TokenBucketLimiter:
+    """
+    Process-wide token bucket with priority queueing
+
+    Tokens refill at rate per second up to burst. Waiting callers are served
+    in priority order (lower value first), FIFO within a priority class.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters = []  # heap of (priority, sequence)
+        self._sequence = itertools.count()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE, timeout=None):
+        """
+        Take one token, queueing behind higher-priority and earlier callers
+
+        Args:
+            priority (int): PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+            timeout (float, optional): Maximum seconds to wait for a token
+
+        Returns:
+            bool: True if a token was taken, False if the timeout expired
+        """
+        if self.rate <= 0:
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ticket = (priority, next(self._sequence))
+
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    self._refill()
+                    at_head = self._waiters[0] == ticket
+                    if at_head and self._tokens >= 1:
+                        self._tokens -= 1
+                        return True
+
+                    # The head waits for the next token; everyone else waits for the head to move
+                    wait = (1 - self._tokens) / self.rate if at_head else None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def available_tokens(self):
+        """Return the number of tokens currently available."""
+        with self._cond:
+            self._refill()
+            return self._tokens
+
+_rate_limiter = TokenBucketLimiter(SERPER_RATE_LIMIT, SERPER_RATE_BURST)
+
+class CircuitOpenError(Exception):
+    """Raised when Serper calls are short-circuited because the breaker is open."""
+
+class CircuitBreaker:
+    """
+    Circuit breaker for an upstream dependency
+
+    The breaker opens after failure_threshold consecutive failures or calls
+    slower than latency_slo. While open, calls are rejected immediately; after
+    reset_timeout a single half-open probe is let through, and its outcome
+    closes the breaker again or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold, latency_slo, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.latency_slo = latency_slo
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+
+    def allow_request(self):
+        """Return True if a call may go upstream now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Let exactly one probe through
+                self.state = self.HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def release_probe(self):
+        """Give the half-open probe slot back when a probe never reached upstream."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record_success(self, latency):
+        """Record a completed call; calls slower than the SLO count as failures."""
+        if latency > self.latency_slo:
+            logger.warning(f"Serper call took {latency:.2f}s, above the {self.latency_slo}s SLO")
+            self.record_failure()
+            return
+
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Serper circuit breaker closed")
+            self.state = self.CLOSED
+            self._consecutive_failures = 0
+
+    def record_failure(self):
+        """Record a failed call, opening the breaker if the threshold is reached."""
+        with self._lock:
+            self._consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                    logger.warning(f"Serper circuit breaker opened after {self._consecutive_failures} failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self):
+        """Return the breaker state and counters."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._consecutive_failures,
+                "trips": self.trips,
+                "rejected": self.rejected
+            }
+
+_circuit_breaker = CircuitBreaker(SERPER_BREAKER_FAILURES, SERPER_BREAKER_LATENCY_SLO, SERPER_BREAKER_RESET_TIMEOUT)
+
+# Running counters of upstream calls and quota used, per query type
+_usage = {}
+_usage_lock = threading.Lock()
+
+def _record_usage(query_type, field, amount=1):
+    with _usage_lock:
+        counters = _usage.setdefault(query_type, {
+            "calls": 0, "credits": 0, "failed": 0, "rate_limited": 0, "queue_seconds": 0.0
+        })
+        counters[field] += amount
+
+def get_serper_usage():
+    """
+    Return upstream call and quota counters for the Serper API key
+
+    Returns:
+        dict: Per query type counters plus totals and remaining quota
+    """
+    with _usage_lock:
+        by_type = {query_type: dict(counters) for query_type, counters in _usage.items()}
+
+    credits_used = sum(counters["credits"] for counters in by_type.values())
+    return {
+        "by_query_type": by_type,
+        "calls": sum(counters["calls"] for counters in by_type.values()),
+        "credits_used": credits_used,
+        "credit_quota": SERPER_CREDIT_QUOTA or None,
+        "credits_remaining": SERPER_CREDIT_QUOTA - credits_used if SERPER_CREDIT_QUOTA else None,
+        "rate_limit": SERPER_RATE_LIMIT,
+        "tokens_available": _rate_limiter.available_tokens(),
+        "circuit": _circuit_breaker.stats()
+    }
+
+def get_cache_stats():
+    """Return statistics for the shared Serper response cache and its disk tier."""
+    stats = _response_cache.stats()
+    stats["disk"] = _disk_cache.stats() if _disk_cache is not None else None
+    stats["coalesced"] = _in_flight.coalesced
+    return stats
+
+def _fetch_from_serper(url, headers, payload, cache_key, query_type, priority=PRIORITY_INTERACTIVE):
+    """Call Serper over the shared connection pool and store the response in both cache tiers."""
+    # Fail fast while Serper is known to be down, without spending a rate-limit token
+    if not _circuit_breaker.allow_request():
+        raise CircuitOpenError("Serper is unavailable, skipping the request")
+
+    # Queue briefly for a rate-limit token instead of hitting Serper's 429s
+    queued_at = time.monotonic()
+    acquired = _rate_limiter.acquire(priority, timeout=SERPER_RATE_LIMIT_WAIT)
+    _record_usage(query_type, "queue_seconds", time.monotonic() - queued_at)
+    if not acquired:
+        _record_usage(query_type, "rate_limited")
+        _circuit_breaker.release_probe()
+        raise RateLimitExceeded(f"No Serper rate-limit token within {SERPER_RATE_LIMIT_WAIT} seconds")
+
+    _record_usage(query_type, "calls")
+    started_at = time.monotonic()
+    try:
+        response = get_http_session().post(
+            url,
+            headers=headers,
+            json=payload,
+            timeout=(SERPER_CONNECT_TIMEOUT, SERPER_READ_TIMEOUT)
+        )
+        response.raise_for_status()  # Raise exception for HTTP errors
+    except Exception:
+        _record_usage(query_type, "failed")
+        _circuit_breaker.record_failure()
+        raise
+    _circuit_breaker.record_success(time.monotonic() - started_at)
+    _record_usage(query_type, "credits", SERPER_CREDITS_PER_QUERY.get(query_type, 1))
+
+    # Only the projected fields are cached; the full payload is dropped right away
+    results = project_results(query_type, response.json())
+    soft_ttl, hard_ttl = SERPER_CACHE_TTLS.get(query_type, SERPER_CACHE_TTLS["search"])
+    _response_cache.set(cache_key, results, hard_ttl, soft_ttl)
+    if _disk_cache is not None:
+        _disk_cache.set(_disk_cache_key(cache_key), results, hard_ttl)
+
+    return results
+
+def _refresh_in_background(url, headers, payload, cache_key, query_type):
+    """Schedule a refresh of a stale cache entry, at most one per key at a time."""
+    with _pending_refreshes_lock:
+        if cache_key in _pending_refreshes:
+            return
+        _pending_refreshes.add(cache_key)
+
+    def refresh():
+        try:
+            _in_flight.do(cache_key, _fetch_from_serper, url, headers, payload, cache_key, query_type,
+                          PRIORITY_BACKGROUND)
+        except Exception as e:
+            # Keep serving the stale entry until its hard TTL runs out
+            logger.warning(f"Background refresh failed for {cache_key}: {str(e)}")
+        finally:
+            with _pending_refreshes_lock:
+                _pending_refreshes.discard(cache_key)
+
+    _refresh_executor.submit(refresh)
+
+def search_destination_info(destination, query_type="search", priority=PRIORITY_INTERACTIVE):
     """
     Search for destination information using Serper.dev Google Search API
 
     Args:
         destination (str): The destination to search for
         query_type (str): Type of search - "search", "images", "places", or "news"
+        priority (int): PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND for rate limiting
 
     Returns:
-        dict: Search results or error message
+        dict: Projected search results (see project_results) or error message
     """
     try:
         # Check if API key is available
@@ -30,9 +654,9 @@ def search_destination_info(destination, query_type="search"):
             return {"error": "API key not configured"}
 
         # API endpoint
-        url = "https://google.serper.dev/search"
+        url = f"{SERPER_BASE_URL}/search"
         if query_type in ["images", "places", "news"]:
-            url = f"https://google.serper.dev/{query_type}"
+            url = f"{SERPER_BASE_URL}/{query_type}"
 
         # Request headers
         headers = {
@@ -47,12 +671,38 @@ def search_destination_info(destination, query_type="search"):
             'hl': 'en'   # Language (English)
         }
 
-        # Make the API request
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()  # Raise exception for HTTP errors
+        # Serve repeated lookups from the shared cache
+        cache_key = make_cache_key(query_type, payload['q'], payload['gl'], payload['hl'])
+        entry = _response_cache.get_entry(cache_key)
+
+        # Fall back to the disk tier and promote hits into memory
+        if entry is None and _disk_cache is not None:
+            disk_entry = _disk_cache.get_entry(_disk_cache_key(cache_key))
+            if disk_entry is not None:
+                stored, expires_at = disk_entry
+                cached = _restore_results(query_type, stored)
+                soft_ttl, hard_ttl = SERPER_CACHE_TTLS.get(query_type, SERPER_CACHE_TTLS["search"])
+                remaining = expires_at - time.time()
+                remaining_fresh = remaining - (hard_ttl - soft_ttl)
+                _response_cache.set(cache_key, cached, remaining, remaining_fresh)
+                entry = (cached, remaining_fresh <= 0)
+
+        if entry is not None:
+            cached, is_stale = entry
+            if is_stale:
+                # Stale-while-revalidate: answer now, refresh for the next caller
+                _refresh_in_background(url, headers, payload, cache_key, query_type)
+            return cached
 
-        return response.json()
+        # Make the API request, sharing it with concurrent callers asking the same query
+        return _in_flight.do(cache_key, _fetch_from_serper, url, headers, payload, cache_key, query_type, priority)
 
+    except RateLimitExceeded as e:
+        logger.warning(f"Rate limited: {str(e)}")
+        return {"error": "Too many requests right now. Please try again in a moment."}
+    except CircuitOpenError as e:
+        logger.warning(str(e))
+        return {"error": "Search service is temporarily unavailable."}
     except requests.exceptions.RequestException as e:
         logger.error(f"API request error: {str(e)}")
         return {"error": f"Failed to fetch data: {str(e)}"}
@@ -73,6 +723,11 @@ def get_destination_images(destination, num_images=4, category=None, time_filter
     Returns:
         list: List of image dictionaries
     """
+    results = search_destination_info(build_image_query(destination, category, time_filter), query_type="images")
+    return shape_image_results(results, destination, num_images, category)
+
+def build_image_query(destination, category=None, time_filter=None):
+    """Build the image search query for a destination, category and time filter."""
     # Modify the search query based on category and time filter
     search_query = f"{destination}"
 
@@ -88,9 +743,21 @@ def get_destination_images(destination, num_images=4, category=None, time_filter
         elif "Classic" in time_filter:
             search_query += " iconic historical"
 
-    # Call the API with the enhanced query
-    results = search_destination_info(search_query, query_type="images")
+    return search_query
 
+def shape_image_results(results, destination, num_images=4, category=None):
+    """
+    Turn a Serper images response into the image dictionaries used by the UI
+
+    Args:
+        results (dict): Response from search_destination_info
+        destination (str): The destination that was searched
+        num_images (int): Number of images to return
+        category (str, optional): Category of images to filter by
+
+    Returns:
+        list: List of image dictionaries
+    """
     if "error" in results:
         # Provide fallback images for Paris if the API fails
         if destination.lower() == "paris":
@@ -152,7 +819,10 @@ def get_destination_images(destination, num_images=4, category=None, time_filter
 def get_destination_attractions(destination):
     """Get top attractions for a destination"""
     results = search_destination_info(destination, query_type="places")
+    return shape_attraction_results(results)
 
+def shape_attraction_results(results):
+    """Turn a Serper places response into attraction dictionaries"""
     if "error" in results:
         return []
 
@@ -174,7 +844,10 @@ def get_destination_attractions(destination):
 def get_destination_news(destination):
     """Get latest news about a destination"""
     results = search_destination_info(destination, query_type="news")
+    return shape_news_results(results)
 
+def shape_news_results(results):
+    """Turn a Serper news response into news dictionaries"""
     if "error" in results:
         return []
 
@@ -190,4 +863,100 @@ def get_destination_news(destination):
         return news
     except Exception as e:
         logger.error(f"Error processing news results: {str(e)}")
-        return []
\ No newline at end of file
+        return []
+
+def get_destination_bundle(destination, num_images=4, category=None, time_filter=None):
+    """
+    Get images, attractions and news for a destination concurrently
+
+    The three lookups run in parallel, so the total wait is the slowest
+    single call rather than the sum of all three.
+
+    Args:
+        destination (str): The destination to search for
+        num_images (int): Number of images to return
+        category (str, optional): Category of images to filter by
+        time_filter (str, optional): Time period to filter images by
+
+    Returns:
+        dict: {"images": [...], "attractions": [...], "news": [...]}
+    """
+    futures = {
+        "images": _search_executor.submit(get_destination_images, destination, num_images, category, time_filter),
+        "attractions": _search_executor.submit(get_destination_attractions, destination),
+        "news": _search_executor.submit(get_destination_news, destination)
+    }
+
+    bundle = {}
+    for name, future in futures.items():
+        try:
+            bundle[name] = future.result()
+        except Exception as e:
+            logger.error(f"Error fetching {name} for {destination}: {str(e)}")
+            bundle[name] = []
+    return bundle
+
+async def search_destination_info_async(destination, query_type="search", deadline=None,
+                                        priority=PRIORITY_INTERACTIVE):
+    """
+    Async counterpart of search_destination_info
+
+    The lookup runs on a worker pool of its own (SERPER_ASYNC_CONCURRENCY
+    threads), apart from the one page renders fan out on, and goes through
+    the same connection pool and caches as the sync functions.
+
+    Args:
+        destination (str): The destination to search for
+        query_type (str): Type of search - "search", "images", "places", or "news"
+        deadline (float, optional): Seconds to wait before giving up
+        priority (int): PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND for rate limiting
+
+    Returns:
+        dict: Projected search results or error message
+    """
+    deadline = SERPER_ASYNC_DEADLINE if deadline is None else deadline
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(_async_executor, search_destination_info, destination, query_type, priority),
+            timeout=deadline
+        )
+    except asyncio.TimeoutError:
+        logger.error(f"API request for {destination} ({query_type}) exceeded its {deadline}s deadline")
+        return {"error": f"Request timed out after {deadline} seconds"}
+
+async def search_many(lookups, concurrency=None, deadline=None, priority=PRIORITY_BACKGROUND):
+    """
+    Run many destination lookups concurrently
+
+    Results are shaped exactly like get_destination_images,
+    get_destination_attractions and get_destination_news; "search" lookups
+    return the search results dict.
+
+    Args:
+        lookups (list): (destination, query_type) tuples, where query_type is
+            "images", "places", "news" or "search"
+        concurrency (int, optional): Maximum number of lookups in flight
+        deadline (float, optional): Per-lookup deadline in seconds
+        priority (int): Rate-limit priority; batches yield to page renders by default
+
+    Returns:
+        list: One result per lookup, in the same order
+    """
+    semaphore = asyncio.Semaphore(concurrency or SERPER_ASYNC_CONCURRENCY)
+
+    async def run(destination, query_type):
+        async with semaphore:
+            if query_type == "images":
+                results = await search_destination_info_async(
+                    build_image_query(destination), "images", deadline, priority)
+                return shape_image_results(results, destination)
+            if query_type == "places":
+                return shape_attraction_results(
+                    await search_destination_info_async(destination, "places", deadline, priority))
+            if query_type == "news":
+                return shape_news_results(
+                    await search_destination_info_async(destination, "news", deadline, priority))
+            return await search_destination_info_async(destination, query_type, deadline, priority)
+
+    return await asyncio.gather(*(run(destination, query_type) for destination, query_type in lookups))
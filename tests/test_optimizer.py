@@ -0,0 +1,65 @@
+import itertools
+import random
+
+import numpy as np
+
+from agentic.interface import Activity, Flight, Hotel, TravelRecommendation
+from agentic.optimizer import activity_score, flight_scores, hotel_score, optimize_bundles
+
+def brute_force_top_k(flights, hotels, activities, budget, nights, preferred, top_k, max_activities):
+    """Score every (flight, hotel) pair with its best affordable activity set, exhaustively."""
+    flight_values = flight_scores(np.array([2 * flight["price"] for flight in flights], dtype=np.float64))
+    pairs = []
+    for flight, flight_value in zip(flights, flight_values):
+        for hotel in hotels:
+            base_cost = 2 * flight["price"] + nights * hotel["price"]
+            if base_cost > budget:
+                continue
+            best = 0.0
+            for count in range(1, max_activities + 1):
+                for combo in itertools.combinations(activities, count):
+                    if base_cost + sum(activity["price"] for activity in combo) <= budget:
+                        best = max(best, sum(activity_score(activity, preferred) for activity in combo))
+            pairs.append(flight_value + hotel_score(hotel) + best)
+    return sorted(pairs, reverse=True)[:top_k]
+
+def test_top_k_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(150):
+        flights = [Flight(f"F{i}", "08:00", "10:00", float(rng.randint(50, 400))) for i in range(rng.randint(1, 4))]
+        hotels = [Hotel(f"H{i}", rng.choice([7.0, 8.0, 8.9, 9.0, 9.5]), float(rng.randint(40, 300)), "Hotel")
+                  for i in range(rng.randint(1, 5))]
+        activities = [Activity(f"A{i}", "2 hours", float(rng.randint(0, 120)), rng.choice(["Food", "Art", "Sports"]),
+                               rating=rng.choice([None, 3.5, 4.8]))
+                      for i in range(rng.randint(0, 6))]
+        budget = rng.randint(300, 3000)
+        top_k = rng.randint(1, 6)
+
+        # One bucket per dollar keeps integer prices exact, so the DP must match brute force
+        bundles = optimize_bundles(flights, hotels, activities, budget, preferred_categories={"Food"},
+                                   top_k=top_k, max_activities=3, buckets=budget)
+        expected = brute_force_top_k(flights, hotels, activities, budget, 5, {"Food"}, top_k, 3)
+
+        assert [round(bundle.score, 9) for bundle in bundles] == [round(score, 9) for score in expected]
+        assert all(bundle.cost <= budget for bundle in bundles)
+
+def test_top_k_keeps_dominated_runner_ups():
+    flights = [Flight("F", "08:00", "10:00", 100.0)]
+    hotels = [Hotel("H1", 9.0, 100.0, "Hotel"), Hotel("H2", 8.9, 100.0, "Hotel"), Hotel("H3", 8.0, 110.0, "Hotel")]
+    bundles = optimize_bundles(flights, hotels, [], 5000, top_k=3)
+    assert [bundle.hotel.name for bundle in bundles] == ["H1", "H2", "H3"]
+
+def test_non_numeric_rating_is_unrated():
+    recommendation = TravelRecommendation(
+        [Flight("F", "08:00", "10:00", 100.0)],
+        [Hotel("H", 9.0, 100.0, "Hotel")],
+        [Activity("Louvre", "2 hours", 0.0, "Sightseeing", rating="N/A")],
+        budget=2000
+    )
+    assert recommendation.get_total_cost() == 700.0
+
+def test_total_cost_is_none_when_nothing_fits():
+    recommendation = TravelRecommendation(
+        [Flight("F", "08:00", "10:00", 900.0)], [Hotel("H", 9.0, 300.0, "Hotel")], [], budget=2000
+    )
+    assert recommendation.get_total_cost() is None